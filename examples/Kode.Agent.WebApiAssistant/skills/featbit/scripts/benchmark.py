@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+FeatBit Query Benchmarks
+Function: Measure routing performance of query.py against the previous implementations
+
+Usage:
+    python scripts/benchmark.py matcher [--questions N]
+    python scripts/benchmark.py daemon [--runs N]
+    python scripts/benchmark.py fetch [--pages N] [--delay SECONDS]
+    python scripts/benchmark.py prompt [--pages N] [--page-kb KB] [--max-tokens N] [--max-doc-tokens N]
+    python scripts/benchmark.py routing [--corpus FILE] [--repeat N]
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Set
+
+from client import QueryClient
+from query import AsyncPageFetcher, FeatBitAnswer, FeatBitDocFinder, HttpFetcher, KeywordMatcher, PromptBuilder
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+SAMPLE_QUESTIONS = [
+    "How to integrate .NET SDK",
+    "Docker deployment steps",
+    "How to configure targeting rules?",
+    "Where to find SDK key?",
+    "How to initialize React SDK?",
+    "K8s deployment minimum config",
+    "How to do A/B testing?",
+    "How to configure users in Python SDK?",
+    "where to find sdk key when deploying?",
+    "what is featbit",
+]
+
+
+def _time_per_call(func: Callable[[str], object], questions: List[str]) -> float:
+    """Return mean microseconds per call of func over questions"""
+    start = time.perf_counter()
+    for question in questions:
+        func(question)
+    return (time.perf_counter() - start) / len(questions) * 1e6
+
+
+def _scaled_keywords(factor: int, rng: random.Random) -> Dict[str, List[str]]:
+    """Grow KEYWORDS by factor with synthetic keywords spread across the groups"""
+    groups = {key: list(words) for key, words in FeatBitDocFinder.KEYWORDS.items()}
+    extra = sum(len(words) for words in groups.values()) * (factor - 1)
+    keys = list(groups)
+    for i in range(extra):
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12)))
+        groups[keys[i % len(keys)]].append(word)
+    return groups
+
+
+class SubstringMatcher:
+    """The original matcher: `any(kw in question)` per keyword group"""
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        self.keyword_groups = groups
+
+    def groups(self, text: str) -> Set[str]:
+        text = text.lower()
+        return {key for key, words in self.keyword_groups.items() if any(kw in text for kw in words)}
+
+
+class SubstringDocFinder(FeatBitDocFinder):
+    """FeatBitDocFinder routing with the original substring matcher"""
+
+    _matcher = SubstringMatcher(FeatBitDocFinder.KEYWORDS)
+
+
+def bench_matcher(args):
+    """Per-question keyword detection: `any(kw in q)` loop vs compiled matcher"""
+    rng = random.Random(42)
+    questions = [rng.choice(SAMPLE_QUESTIONS).lower() for _ in range(args.questions)]
+
+    print(f"{'scale':>6} {'keywords':>9} {'loop us/q':>10} {'matcher us/q':>13} {'speedup':>8}")
+    for factor in (1, 10, 100, 1000):
+        groups = _scaled_keywords(factor, rng)
+        matcher = KeywordMatcher(groups)
+
+        loop_us = _time_per_call(SubstringMatcher(groups).groups, questions)
+        matcher_us = _time_per_call(matcher.groups, questions)
+        total = sum(len(words) for words in groups.values())
+        print(f"{factor:>5}x {total:>9} {loop_us:>10.1f} {matcher_us:>13.1f} {loop_us / matcher_us:>7.1f}x")
+
+
+def bench_daemon(args):
+    """Round-trip latency: cold `query.py` process vs warm daemon"""
+    query_py = os.path.join(SCRIPTS_DIR, "query.py")
+    client_py = os.path.join(SCRIPTS_DIR, "client.py")
+    question = SAMPLE_QUESTIONS[0]
+
+    def run_cold(argv, env=None):
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            subprocess.run([sys.executable] + argv, check=True, stdout=subprocess.DEVNULL, env=env)
+        return (time.perf_counter() - start) / args.runs * 1e3
+
+    cold_ms = run_cold([query_py, question, "--json"])
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "featbit-query.sock")
+    daemon = subprocess.Popen([sys.executable, query_py, "--serve", "--socket", socket_path],
+                              stdout=subprocess.PIPE)
+    try:
+        daemon.stdout.readline()  # wait for the "listening" banner
+        client = QueryClient(socket_path)
+        start = time.perf_counter()
+        for _ in range(args.runs * 100):
+            client.ask(question)
+        warm_ms = (time.perf_counter() - start) / (args.runs * 100) * 1e3
+        client.close()
+
+        env = dict(os.environ, FEATBIT_QUERY_SOCKET=socket_path)
+        client_ms = run_cold([client_py, question], env)
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    print(f"cold query.py process:        {cold_ms:8.2f} ms/question")
+    print(f"client.py process via daemon: {client_ms:8.2f} ms/question")
+    print(f"warm socket round trip:       {warm_ms:8.3f} ms/question")
+
+
+def _start_doc_server(delay: float, body: bytes) -> ThreadingHTTPServer:
+    """Local stand-in for the documentation hosts: every GET sleeps delay then returns body"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/markdown; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_fetch(args):
+    """Wall-clock time to fetch N pages: sequential loop vs AsyncPageFetcher"""
+    server = _start_doc_server(args.delay, b"# FeatBit\n" * 2000)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/page/{i}" for i in range(args.pages)]
+    try:
+        fetcher = HttpFetcher()
+        start = time.perf_counter()
+        for url in urls:
+            fetcher(url, {})
+        sequential = time.perf_counter() - start
+
+        concurrent = AsyncPageFetcher(fetcher=HttpFetcher(), max_connections=args.pages, per_host=args.pages)
+        start = time.perf_counter()
+        pages = concurrent.fetch_all(urls)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    failed = sum(1 for page in pages if "error" in page)
+    print(f"pages: {args.pages}, server delay: {args.delay * 1e3:.0f} ms, failed: {failed}")
+    print(f"sequential: {sequential * 1e3:8.1f} ms")
+    print(f"concurrent: {elapsed * 1e3:8.1f} ms ({sequential / elapsed:.1f}x)")
+
+
+def _concat_prompt(question: str, page_contents: List[Dict]) -> str:
+    """The original `prompt += ...` implementation of format_answer_prompt"""
+    prompt = PromptBuilder.HEADER.format(question=question)
+    for i, content in enumerate(page_contents, 1):
+        prompt += f"\n## Document {i}: {content['url']}\n\n"
+        prompt += f"{content['content']}\n\n"
+        prompt += "---\n"
+    prompt += PromptBuilder.FOOTER
+    return prompt
+
+
+def _measure(func: Callable[[], object], runs: int = 3):
+    """
+    Return (best seconds over runs, peak traced bytes) for func
+
+    Time and memory come from separate calls: tracemalloc slows allocation-heavy
+    code several times over, so timing a traced call would inflate the result.
+    """
+    elapsed = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(elapsed), peak
+
+
+def bench_prompt(args):
+    """Prompt build time and peak memory over N large pages"""
+    line = "FeatBit SDK configuration option `flag-key` controls the evaluation default.\n"
+    content = line * (args.page_kb * 1024 // len(line))
+    pages = [{"url": f"https://docs.featbit.co/page/{i}", "content": content} for i in range(args.pages)]
+    question = "How to configure the .NET SDK?"
+    assistant = FeatBitAnswer()
+
+    print(f"{args.pages} pages x {len(content) // 1024} KB")
+    print(f"{'mode':<26} {'ms':>8} {'peak MB':>9} {'prompt KB':>10}")
+    modes = [
+        ("concatenation", lambda: _concat_prompt(question, pages)),
+        ("builder, no budget", lambda: assistant.format_answer_prompt(question, pages)),
+        (f"builder, {args.max_tokens} tokens",
+         lambda: assistant.format_answer_prompt(question, pages, max_tokens=args.max_tokens)),
+        (f"chunked, {args.max_doc_tokens}/doc",
+         lambda: assistant.build_answer_prompt(question, pages, max_doc_tokens=args.max_doc_tokens).build()),
+    ]
+    for name, func in modes:
+        size = len(func()) // 1024
+        elapsed, peak = _measure(func)
+        print(f"{name:<26} {elapsed * 1e3:>8.1f} {peak / 2 ** 20:>9.1f} {size:>10}")
+
+
+def bench_routing(args):
+    """Routing accuracy and latency on the labelled corpus: substring vs word-boundary matching"""
+    with open(args.corpus, encoding="utf-8") as corpus:
+        cases = [json.loads(line) for line in corpus if line.strip()]
+    questions = [case["question"] for case in cases] * args.repeat
+
+    print(f"{len(cases)} labelled questions")
+    print(f"{'matcher':<15} {'accuracy':>9} {'us/query':>9}")
+    for name, finder in (("substring", SubstringDocFinder), ("word-boundary", FeatBitDocFinder)):
+        misses = [case for case in cases if finder.find_pages(case["question"])[0]["url"] != case["expected"]]
+        accuracy = 1 - len(misses) / len(cases)
+        latency = _time_per_call(finder.find_pages, questions)
+        print(f"{name:<15} {accuracy:>8.1%} {latency:>9.1f}")
+        if args.verbose:
+            for case in misses:
+                print(f"    miss: {case['question']}")
+
+
+def main():
+    """Command line entry"""
+    parser = argparse.ArgumentParser(description="FeatBit query benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    matcher = subparsers.add_parser("matcher", help="Keyword matcher latency by keyword count")
+    matcher.add_argument("--questions", type=int, default=2000, help="Questions per scale")
+    matcher.set_defaults(func=bench_matcher)
+
+    daemon = subparsers.add_parser("daemon", help="Cold CLI vs daemon round-trip latency")
+    daemon.add_argument("--runs", type=int, default=20, help="Process launches per mode")
+    daemon.set_defaults(func=bench_daemon)
+
+    fetch = subparsers.add_parser("fetch", help="Sequential vs concurrent page fetching")
+    fetch.add_argument("--pages", type=int, default=10, help="Number of pages")
+    fetch.add_argument("--delay", type=float, default=0.2, help="Simulated server latency in seconds")
+    fetch.set_defaults(func=bench_fetch)
+
+    prompt = subparsers.add_parser("prompt", help="Prompt build time and peak memory")
+    prompt.add_argument("--pages", type=int, default=50, help="Number of pages")
+    prompt.add_argument("--page-kb", type=int, default=200, help="Size of each page in KB")
+    prompt.add_argument("--max-tokens", type=int, default=32000, help="Token budget for the budgeted run")
+    prompt.add_argument("--max-doc-tokens", type=int, default=2000, help="Per-document budget for the chunked run")
+    prompt.set_defaults(func=bench_prompt)
+
+    routing = subparsers.add_parser("routing", help="Routing accuracy and latency on a labelled corpus")
+    routing.add_argument("--corpus", default=os.path.join(SCRIPTS_DIR, "eval_corpus.jsonl"),
+                         help="JSON lines of {question, expected}")
+    routing.add_argument("--repeat", type=int, default=50, help="Corpus passes for the latency measurement")
+    routing.add_argument("--verbose", action="store_true", help="List misrouted questions")
+    routing.set_defaults(func=bench_routing)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
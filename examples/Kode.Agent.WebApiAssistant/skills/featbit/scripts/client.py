@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+FeatBit Query Client
+Function: Route a question through the warm query.py daemon, falling back to in-process routing
+
+Start the daemon once:
+    python scripts/query.py --serve --socket /tmp/featbit-query.sock
+
+Then query it:
+    python scripts/client.py "How to integrate .NET SDK"
+
+Only lightweight modules are imported on the daemon path; query.py is imported
+lazily when the daemon is not running.
+"""
+
+import json
+import os
+import socket
+import sys
+
+DEFAULT_SOCKET = os.environ.get("FEATBIT_QUERY_SOCKET", "/tmp/featbit-query.sock")
+
+
+class QueryClient:
+    """JSON-RPC client for the query.py routing daemon"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET, timeout=2.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = None
+        self._reader = None
+        self._next_id = 0
+
+    def _connect(self):
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+            self._reader = sock.makefile("r", encoding="utf-8")
+
+    def call(self, method, **params):
+        """
+        Send one request to the daemon
+
+        A connection reused from an earlier call is retried once on a fresh
+        connection if it turns out to be closed, e.g. after a daemon restart.
+
+        Raises:
+            OSError: If the daemon is unreachable or the connection breaks
+            ValueError: If the daemon's reply is not valid JSON
+            RuntimeError: If the daemon returns an error
+        """
+        reused = self._sock is not None
+        try:
+            return self._call(method, params)
+        except ConnectionError:
+            if not reused:
+                raise
+            return self._call(method, params)
+
+    def _call(self, method, params):
+        self._connect()
+        self._next_id += 1
+        request_id = self._next_id
+        request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        try:
+            self._sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Daemon closed the connection")
+            response = json.loads(line)
+            if not isinstance(response, dict) or response.get("id") != request_id:
+                raise ConnectionError(f"Response does not match request id {request_id}")
+        except BaseException:
+            # A timeout or broken pipe can leave half a reply in the stream:
+            # drop the connection so the next call starts on a clean one
+            self.close()
+            raise
+        if "error" in response:
+            raise RuntimeError(response["error"]["message"])
+        return response["result"]
+
+    def ask(self, question):
+        """Route question via the daemon, or in-process if it is not running"""
+        try:
+            return self.call("ask", question=question)
+        except (OSError, ValueError, AttributeError):
+            # AttributeError: platform without AF_UNIX
+            return _ask_in_process(question)
+
+    def close(self):
+        if self._sock is not None:
+            self._reader.close()
+            self._sock.close()
+            self._sock = None
+            self._reader = None
+
+
+def _ask_in_process(question):
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from query import FeatBitAnswer
+
+    return FeatBitAnswer().ask(question)
+
+
+def main():
+    """Command line entry"""
+    if len(sys.argv) < 2:
+        print("Usage: python scripts/client.py <question>")
+        sys.exit(1)
+
+    client = QueryClient()
+    try:
+        result = client.ask(" ".join(sys.argv[1:]))
+    finally:
+        client.close()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,95 +4,351 @@ FeatBit Documentation Query Assistant
 Function: Locate relevant official documentation pages based on user questions and return fetch instructions
 """
 
-from typing import List, Dict, Optional
+import hashlib
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Dict, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Set, Tuple, TextIO
 from datetime import datetime
 
+REFERENCES_DIR = Path(__file__).resolve().parent.parent / "references"
+
+# Compiled routing tables, generated from ROUTING_SOURCES by `query.py --compile`
+ROUTING_FILE = "routing.json"
+ROUTING_SOURCES = ("page-map.md", "keywords.md")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are can do does for from how i in is it my of on or the to use using what when where which "
+    "why with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric terms, dropping common stopwords"""
+    return [word for word in _WORD_RE.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def read_markdown_tables(path: Path) -> List[Dict[str, str]]:
+    """
+    Read every pipe table in a markdown file
+
+    Args:
+        path: Markdown file path
+
+    Returns:
+        List of rows keyed by header, each with the nearest preceding "## " heading under "section"
+    """
+    rows = []
+    section = ""
+    header = None
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("## "):
+            section = line[3:].strip()
+        if not line.startswith("|"):
+            header = None
+            continue
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        if header is None:
+            header = cells
+        elif not all(set(cell) <= set("-: ") for cell in cells):
+            row = dict(zip(header, cells))
+            row["section"] = section
+            rows.append(row)
+    return rows
+
+
+def _source_hashes(references_dir: Path) -> Dict[str, str]:
+    return {
+        name: hashlib.sha256((references_dir / name).read_bytes()).hexdigest()
+        for name in ROUTING_SOURCES
+    }
+
+
+def compile_routing(references_dir: Path = REFERENCES_DIR) -> Dict:
+    """
+    Compile the routing tables from the reference markdown
+
+    Pages come from the page-map.md tables (the Key column holds one or more
+    `category/key` entries per URL), keyword groups from the keywords.md
+    tables with Keyword Group / Match Words columns.
+
+    Returns:
+        Routing dictionary containing {sources, pages, keywords, page_rows}
+    """
+    pages: Dict[str, Dict[str, str]] = {}
+    page_rows = []
+    for row in read_markdown_tables(references_dir / "page-map.md"):
+        if not row.get("URL") or not row.get("Key"):
+            continue
+        for entry in row["Key"].replace("`", "").split(","):
+            category, _, key = entry.strip().partition("/")
+            pages.setdefault(category, {})[key] = row["URL"]
+        page_rows.append({name: value for name, value in row.items() if name not in ("Key", "section")})
+
+    keywords: Dict[str, List[str]] = {}
+    for row in read_markdown_tables(references_dir / "keywords.md"):
+        if "Keyword Group" in row and "Match Words" in row:
+            words = [word.strip() for word in row["Match Words"].split(",")]
+            keywords[row["Keyword Group"]] = [word for word in words if word]
+
+    return {
+        "sources": _source_hashes(references_dir),
+        "pages": pages,
+        "keywords": keywords,
+        "page_rows": page_rows,
+    }
+
+
+def load_routing(references_dir: Path = REFERENCES_DIR) -> Dict:
+    """
+    Load the compiled routing tables
+
+    Falls back to compiling in memory when the artifact is missing or was
+    built from different reference files.
+    """
+    try:
+        routing = json.loads((references_dir / ROUTING_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        routing = None
+    if routing is None or routing.get("sources") != _source_hashes(references_dir):
+        routing = compile_routing(references_dir)
+    return routing
+
+
+class BM25Index:
+    """
+    In-memory inverted index with Okapi BM25 scoring
+    """
+
+    def __init__(self, documents: Dict[str, List[str]], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            documents: Mapping of document id to its terms
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.doc_len = {doc_id: len(terms) for doc_id, terms in documents.items()}
+        self.avg_len = sum(self.doc_len.values()) / max(len(documents), 1)
+        self.postings: Dict[str, Dict[str, int]] = {}
+        for doc_id, terms in documents.items():
+            for term, freq in Counter(terms).items():
+                self.postings.setdefault(term, {})[doc_id] = freq
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+
+    def search(self, terms: Iterable[str], top_k: int = 3) -> List[Tuple[str, float]]:
+        """
+        Score documents against query terms
+
+        Returns:
+            Up to top_k (doc_id, score) pairs, best first; documents scoring 0 are omitted
+        """
+        scores: Dict[str, float] = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf[term]
+            for doc_id, freq in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.doc_len[doc_id] / self.avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
+
+
+class KeywordMatcher:
+    """
+    Word-boundary keyword matcher
+
+    Keywords of all groups are compiled once into a frozenset of normalized
+    terms (multi-word keywords become space-joined n-grams). A question is
+    tokenized once into its term set (tokens, the parts of compound tokens such
+    as "node.js", light plural/verb stems and n-grams), so finding the matched
+    groups is a single set intersection. Unlike substring matching, "go" does
+    not match "google" and "ts" does not match "settings".
+    """
+
+    _TOKEN_RE = re.compile(r"\.?[a-z0-9]+(?:[./#+-][a-z0-9]+)*[#+]*")
+    _PART_RE = re.compile(r"[./-]")
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        keyword_groups: Dict[str, List[Tuple[str, str]]] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                term = " ".join(self._TOKEN_RE.findall(keyword.lower()))
+                hits = keyword_groups.setdefault(term, [])
+                if (group, keyword) not in hits:
+                    hits.append((group, keyword))
+        self._keyword_groups: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            term: tuple(hits) for term, hits in keyword_groups.items() if term
+        }
+        self.keywords = frozenset(self._keyword_groups)
+        self.max_ngram = max((term.count(" ") + 1 for term in self.keywords), default=1)
+        self._count_patterns: Dict[FrozenSet[str], Tuple] = {}
+
+    @staticmethod
+    def _stems(word: str) -> List[str]:
+        stems = []
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            stems.append(word[:-1])
+        for suffix in ("ing", "ed"):
+            if len(word) > len(suffix) + 2 and word.endswith(suffix):
+                stems.append(word[:-len(suffix)])
+        return stems
+
+    def _sequences(self, text: str) -> List[List[Tuple[int, str]]]:
+        """Token sequence of text, plus the sequence with compound tokens split when it differs"""
+        tokens = [(m.start(), m.group()) for m in self._TOKEN_RE.finditer(text.lower())]
+        parts = []
+        split = False
+        for offset, token in tokens:
+            # Compounds that are keywords themselves ("node.js", "a/b") stay whole
+            if token not in self.keywords and self._PART_RE.search(token.lstrip(".")):
+                parts += [(offset, part) for part in self._PART_RE.split(token) if part]
+                split = True
+            else:
+                parts.append((offset, token))
+        return [tokens, parts] if split else [tokens]
+
+    def _grams(self, words: List[str]) -> Iterator[Tuple[int, str]]:
+        """Yield (start index, term) for every n-gram of words and its stemmed variants"""
+        stems = self._stems
+        for i in range(len(words)):
+            gram = ""
+            for n in range(min(self.max_ngram, len(words) - i)):
+                last = words[i + n]
+                prefix = gram + " " if n else ""
+                gram = prefix + last
+                yield i, gram
+                for stem in stems(last):
+                    yield i, prefix + stem
+
+    def terms(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Tokenize text into (offset, term) occurrences
+
+        Terms are lowercase tokens, the parts of compound tokens that are not
+        keywords, light stems and n-grams up to the longest keyword, each at the
+        offset of its first token.
+        """
+        terms = []
+        for sequence in self._sequences(text):
+            terms += [(sequence[i][0], gram) for i, gram in self._grams([word for _, word in sequence])]
+        return terms
+
+    def term_set(self, text: str) -> FrozenSet[str]:
+        """Return the set of terms in text"""
+        return frozenset(
+            gram
+            for sequence in self._sequences(text)
+            for _, gram in self._grams([word for _, word in sequence])
+        )
+
+    def scan(self, text: str) -> List[Tuple[int, str, str]]:
+        """
+        Find every keyword occurrence in text
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            List of (offset, group, keyword) tuples, offset being the start index of the hit
+        """
+        hits = []
+        seen = set()
+        for offset, term in self.terms(text):
+            for group, keyword in self._keyword_groups.get(term, ()):
+                if (offset, group, keyword) not in seen:
+                    seen.add((offset, group, keyword))
+                    hits.append((offset, group, keyword))
+        return hits
+
+    def groups(self, text: str) -> Set[str]:
+        """Return the set of keyword groups that occur in text"""
+        return {
+            group
+            for term in self.keywords & self.term_set(text)
+            for group, _ in self._keyword_groups[term]
+        }
+
+    def _count_pattern(self, groups: FrozenSet[str]):
+        """One regex over the keywords of groups (and their plural/verb forms) in normalized text"""
+        cached = self._count_patterns.get(groups)
+        if cached is None:
+            variants: Dict[str, Set[str]] = {}
+            for term, hits in self._keyword_groups.items():
+                matched = {group for group, _ in hits if group in groups}
+                term = " ".join(self._PART_RE.sub(" ", term).split())
+                if matched and term:
+                    for variant in (term, term + "s", term + "ed", term + "ing"):
+                        variants.setdefault(variant, set()).update(matched)
+            alternatives = "|".join(re.escape(variant) for variant in sorted(variants, key=len, reverse=True))
+            pattern = re.compile(rf" ({alternatives})(?= )") if variants else None
+            cached = self._count_patterns[groups] = (pattern, variants)
+        return cached
+
+    def count_groups(self, text: str, groups: Iterable[str]) -> Counter:
+        """
+        Count keyword occurrences of the given groups in text
+
+        A faster approximation of scan for long text: text is reduced to its
+        space-separated tokens (compounds split into parts) and searched with
+        a single regex, so the cost is one C-level pass instead of n-grams and
+        stems per token. Overlapping keywords count once, at the longest.
+
+        Returns:
+            Counter of group -> occurrences
+        """
+        pattern, variants = self._count_pattern(frozenset(groups))
+        if pattern is None:
+            return Counter()
+        normalized = self._PART_RE.sub(" ", f" {' '.join(self._TOKEN_RE.findall(text.lower()))} ")
+        counts: Counter = Counter()
+        for variant, count in Counter(pattern.findall(normalized)).items():
+            for group in variants[variant]:
+                counts[group] += count
+        return counts
+
 
 class FeatBitDocFinder:
     """FeatBit Documentation Page Locator"""
 
-    # Documentation page mapping (organized by category)
+    # Routing tables compiled from references/page-map.md and references/keywords.md
     # Note: SDK docs are on GitHub, other docs are on docs.featbit.co
-    PAGES = {
-        # SDK Integration (GitHub repositories)
-        "sdk": {
-            "overview": "https://docs.featbit.co/sdk/overview",
-            "javascript": "https://github.com/featbit/featbit-js-client-sdk",
-            "react": "https://github.com/featbit/featbit-react-client-sdk",
-            "react-native": "https://github.com/featbit/featbit-react-native-sdk",
-            "node": "https://github.com/featbit/featbit-node-server-sdk",
-            "dotnet-server": "https://github.com/featbit/featbit-dotnet-sdk",
-            "dotnet-client": "https://github.com/featbit/featbit-dotnet-client-sdk",
-            "java": "https://github.com/featbit/featbit-java-sdk",
-            "python": "https://github.com/featbit/featbit-python-sdk",
-            "go": "https://github.com/featbit/featbit-go-sdk",
-        },
-        # Deployment Installation
-        "deployment": {
-            "overview": "https://docs.featbit.co/installation/deployment-options",
-            "docker": "https://docs.featbit.co/installation/docker-compose",
-            "kubernetes": "https://github.com/featbit/featbit-charts",
-            "helm": "https://github.com/featbit/featbit-charts",
-            "azure": "https://github.com/featbit/azure-container-apps",
-            "aws": "https://docs.featbit.co/installation/terraform-aws",
-            "terraform": "https://docs.featbit.co/installation/terraform-aws",
-            "own-infra": "https://docs.featbit.co/installation/use-your-own-infrastructure",
-        },
-        # Feature Management
-        "features": {
-            "overview": "https://docs.featbit.co/feature-flags/the-flag-list",
-            "creating": "https://docs.featbit.co/getting-started/create-two-feature-flags",
-            "targeting": "https://docs.featbit.co/feature-flags/targeting-users-with-flags/targeting-rules",
-            "rollouts": "https://docs.featbit.co/feature-flags/targeting-users-with-flags/percentage-rollouts",
-            "ab-testing": "https://docs.featbit.co/getting-started/how-to-guides/ab-testing",
-            "variations": "https://docs.featbit.co/feature-flags/create-flag-variations",
-        },
-        # Configuration Management
-        "config": {
-            "environment": "https://docs.featbit.co/feature-flags/organizing-flags/environments",
-            "sdk-key": "https://docs.featbit.co/getting-started/connect-an-sdk",
-            "webhook": "https://docs.featbit.co/integrations/webhooks",
-            "segment": "https://docs.featbit.co/feature-flags/users-and-user-segments/user-segments",
-        },
-        # Concepts
-        "concepts": {
-            "overview": "https://docs.featbit.co/",
-            "getting-started": "https://docs.featbit.co/getting-started/connect-an-sdk",
-        },
-    }
+    _routing = load_routing()
+
+    # Documentation page mapping (organized by category)
+    PAGES: Dict[str, Dict[str, str]] = _routing["pages"]
 
     # Keyword mapping
-    KEYWORDS = {
-        # SDK Related
-        "sdk": ["sdk", "client", "server", "integration", "integration", "initialize", "initialization"],
-        "dotnet": ["dotnet", ".net", "c#", "csharp"],
-        "javascript": ["javascript", "js", "typescript", "ts"],
-        "react": ["react", "reactjs"],
-        "node": ["node", "nodejs", "node.js"],
-        "python": ["python", "py"],
-        "go": ["go", "golang"],
-        "java": ["java", "kotlin", "spring"],
-
-        # Deployment Related
-        "deployment": ["deployment", "deploy", "install", "installation", "setup"],
-        "docker": ["docker", "container"],
-        "kubernetes": ["kubernetes", "k8s", "k8"],
-        "helm": ["helm"],
-        "azure": ["azure", "microsoft cloud"],
-        "aws": ["aws", "amazon"],
-
-        # Feature Related
-        "feature": ["feature flag", "feature toggle", "toggle", "flag", "feature"],
-        "targeting": ["targeting", "rule", "rules"],
-        "rollout": ["rollout", "gradual", "publish"],
-        "ab-test": ["ab test", "a/b", "experiment"],
-
-        # Configuration Related
-        "config": ["configuration", "config", "setting", "settings"],
-        "environment": ["environment", "env"],
-        "sdk-key": ["sdk key", "secret", "key"],
-        "webhook": ["webhook", "callback"],
-    }
+    KEYWORDS: Dict[str, List[str]] = _routing["keywords"]
+
+    # Platform keyword groups (checked in KEYWORDS order)
+    PLATFORMS = ["dotnet", "javascript", "react", "node", "python", "go", "java"]
+
+    # Category detection priority: (keyword group, PAGES category)
+    CATEGORY_PRIORITY = [
+        ("deployment", "deployment"),
+        ("feature", "features"),
+        ("config", "config"),
+        ("sdk", "sdk"),
+    ]
+
+    # Compiled once at class load
+    _matcher = KeywordMatcher(KEYWORDS)
+
+    # Ranked retrieval index, built on first search()
+    _index: Optional[BM25Index] = None
+    _index_pages: Dict[str, Dict[str, str]] = {}
 
     @classmethod
     def find_pages(cls, question: str) -> List[Dict[str, str]]:
@@ -105,27 +361,22 @@ class FeatBitDocFinder:
         Returns:
             List of relevant pages, each containing {url, category, reason}
         """
-        question_lower = question.lower()
         results = []
 
+        # Single pass over the question collects every matched keyword group
+        matched = cls._matcher.groups(question.lower())
+
         # 1. Detect platform/technology keywords
-        platform = None
-        for key, keywords in cls.KEYWORDS.items():
-            if any(kw in question_lower for kw in keywords):
-                if key in ["dotnet", "javascript", "react", "node", "python", "go", "java"]:
-                    platform = key
-                    break
+        platform = next(
+            (key for key in cls.KEYWORDS if key in matched and key in cls.PLATFORMS),
+            None,
+        )
 
         # 2. Detect category
-        category = None
-        if any(kw in question_lower for kw in cls.KEYWORDS["deployment"]):
-            category = "deployment"
-        elif any(kw in question_lower for kw in cls.KEYWORDS["feature"]):
-            category = "features"
-        elif any(kw in question_lower for kw in cls.KEYWORDS["config"]):
-            category = "config"
-        elif any(kw in question_lower for kw in cls.KEYWORDS["sdk"]):
-            category = "sdk"
+        category = next(
+            (cat for group, cat in cls.CATEGORY_PRIORITY if group in matched),
+            None,
+        )
 
         # 3. Combine results
         if category and category in cls.PAGES:
@@ -155,6 +406,81 @@ class FeatBitDocFinder:
 
         return results
 
+    @classmethod
+    def find_pages_batch(cls, questions: Iterable[str]) -> Iterator[List[Dict[str, str]]]:
+        """
+        Find relevant documentation pages for many questions
+
+        Args:
+            questions: Iterable of user questions (consumed lazily)
+
+        Returns:
+            Iterator yielding the find_pages result for each question, in input order
+        """
+        for question in questions:
+            yield cls.find_pages(question)
+
+    @classmethod
+    def _build_index(cls):
+        """Index every PAGES entry with its keyword groups and page-map.md row"""
+        category_groups = {category: group for group, category in cls.CATEGORY_PRIORITY}
+        page_map = {}
+        for row in cls._routing["page_rows"]:
+            page_map.setdefault(row["URL"], []).append(row)
+
+        documents: Dict[str, List[str]] = {}
+        pages: Dict[str, Dict[str, str]] = {}
+        for category, entries in cls.PAGES.items():
+            for key, url in entries.items():
+                if url not in documents:
+                    rows = page_map.get(url, [])
+                    title = rows[0].get("Page", key) if rows else key
+                    pages[url] = {"url": url, "category": category, "title": title}
+                    documents[url] = tokenize(" ".join(
+                        value for row in rows for name, value in row.items()
+                        if name != "URL" and value != "-"
+                    ))
+                terms = documents[url]
+                terms += tokenize(f"{category} {key}")
+                for group in (category_groups.get(category), key, key.split("-")[0]):
+                    for keyword in cls.KEYWORDS.get(group, []):
+                        terms += tokenize(keyword)
+
+        cls._index_pages = pages
+        cls._index = BM25Index(documents)
+
+    @classmethod
+    def search(cls, question: str, top_k: int = 3) -> List[Dict]:
+        """
+        Rank documentation pages for a question with BM25 scoring
+
+        Args:
+            question: User question
+            top_k: Maximum number of pages to return
+
+        Returns:
+            List of pages, each containing {url, category, reason, score}, best first;
+            falls back to find_pages when no indexed term matches
+
+        Raises:
+            ValueError: If top_k is less than 1
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be a positive integer")
+        if cls._index is None:
+            cls._build_index()
+
+        results = []
+        for url, score in cls._index.search(tokenize(question), top_k):
+            page = cls._index_pages[url]
+            results.append({
+                "url": url,
+                "category": page["category"],
+                "reason": f"Ranked match: {page['title']}",
+                "score": round(score, 4),
+            })
+        return results or cls.find_pages(question)
+
     @classmethod
     def get_all_pages(cls) -> List[str]:
         """Get all documentation page URLs"""
@@ -164,81 +490,1030 @@ class FeatBitDocFinder:
         return list(set(all_urls))
 
 
+class Chunk(NamedTuple):
+    """A section of a markdown document"""
+    position: int
+    heading: str
+    text: str
+
+
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.*)")
+_FENCE_RE = re.compile(r"(`{3,}|~{3,})(.*)")
+
+
+def _hard_split(text: str, max_chars: int) -> Iterator[str]:
+    """Cut text without blank lines into pieces of at most max_chars, at line ends, else at spaces"""
+    piece = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > max_chars:
+            cut = line.rfind(" ", max_chars // 2, max_chars)
+            cut = cut + 1 if cut > 0 else max_chars
+            if piece:
+                yield piece
+                piece = ""
+            yield line[:cut]
+            line = line[cut:]
+        if len(piece) + len(line) > max_chars:
+            yield piece
+            piece = ""
+        piece += line
+    if piece:
+        yield piece
+
+
+def split_markdown(content: str, max_chunk_chars: int = 2000) -> List[Chunk]:
+    """
+    Split markdown into heading sections
+
+    Headings inside fenced code blocks are ignored; a fence is closed only by
+    a fence of the same character at least as long. Sections longer than
+    max_chunk_chars are further split at blank lines, and paragraphs still
+    longer than that at line ends (or spaces), so no chunk exceeds max_chunk_chars.
+
+    Returns:
+        Chunks in document order; text before the first heading has an empty heading
+    """
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    fence = None
+    for line in content.splitlines(keepends=True):
+        match = _FENCE_RE.match(line.lstrip())
+        if match:
+            marker, rest = match.groups()
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence) and not rest.strip():
+                fence = None
+        match = _HEADING_RE.match(line) if fence is None else None
+        if match:
+            sections.append((match.group(1).strip(), []))
+        sections[-1][1].append(line)
+
+    chunks: List[Chunk] = []
+    for heading, lines in sections:
+        text = "".join(lines)
+        if not text.strip():
+            continue
+        if len(text) <= max_chunk_chars:
+            chunks.append(Chunk(len(chunks), heading, text.strip("\n")))
+            continue
+        piece = ""
+        for paragraph in re.split(r"\n\s*\n", text):
+            if piece and len(piece) + len(paragraph) > max_chunk_chars:
+                chunks.append(Chunk(len(chunks), heading, piece.strip("\n")))
+                piece = ""
+            if len(paragraph) > max_chunk_chars:
+                for part in _hard_split(paragraph, max_chunk_chars):
+                    if part.strip():
+                        chunks.append(Chunk(len(chunks), heading, part.strip("\n")))
+                continue
+            piece += paragraph + "\n\n"
+        if piece.strip():
+            chunks.append(Chunk(len(chunks), heading, piece.strip("\n")))
+    return chunks
+
+
+def score_chunks(question: str, chunks: List[Chunk]) -> List[float]:
+    """
+    Score chunks against a question
+
+    A chunk scores for every KEYWORDS group that also occurs in the question
+    (so synonyms such as "c#" and "dotnet" count alike), with diminishing
+    returns for repeats, plus the plain question terms it shares. Matches in
+    the heading count extra. Chunk text is matched with count_groups and a
+    plain word set, so long documents cost a few regex passes.
+    """
+    matcher = FeatBitDocFinder._matcher
+    question_groups = matcher.groups(question.lower())
+    question_terms = set(tokenize(question))
+
+    scores = []
+    for chunk in chunks:
+        text = chunk.text.lower()
+        hits = matcher.count_groups(text, question_groups) if question_groups else {}
+        score = sum(1 + math.log(count) for count in hits.values())
+        score += 0.5 * len(question_terms.intersection(_WORD_RE.findall(text)))
+        heading = chunk.heading.lower()
+        if question_groups & matcher.groups(heading) or question_terms.intersection(tokenize(heading)):
+            score += 1
+        scores.append(score)
+    return scores
+
+
+def select_chunks(question: str, content: str, max_chars: int, separator: str = "\n\n") -> List[Chunk]:
+    """
+    Pick the highest scoring chunks of content that fit in max_chars
+
+    Returns:
+        Selected chunks in document order; empty when no chunk is relevant or none fits
+    """
+    chunks = split_markdown(content)
+    scores = score_chunks(question, chunks)
+    selected = []
+    used = 0
+    for score, chunk in sorted(zip(scores, chunks), key=lambda item: (-item[0], item[1].position)):
+        if score <= 0:
+            break
+        cost = len(chunk.text) + (len(separator) if selected else 0)
+        if used + cost <= max_chars:
+            selected.append(chunk)
+            used += cost
+    return sorted(selected, key=lambda chunk: chunk.position)
+
+
+class FetchResponse(NamedTuple):
+    """Result of a single HTTP fetch"""
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class FetchError(IOError):
+    """HTTP fetch failed with an error status"""
+
+    def __init__(self, url: str, status: int):
+        super().__init__(f"HTTP {status} for {url}")
+        self.url = url
+        self.status = status
+
+
+class HttpFetcher:
+    """
+    Default page fetcher with a keep-alive connection pool per host
+
+    Any callable(url, headers) -> FetchResponse can replace it. Safe to call
+    from several threads at once.
+    """
+
+    MAX_REDIRECTS = 5
+
+    def __init__(self, timeout: float = 15.0, max_idle_per_host: int = 4):
+        import threading
+
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str], List] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, scheme: str, netloc: str):
+        import http.client
+
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return connection_class(netloc, timeout=self.timeout), False
+
+    def _release(self, scheme: str, netloc: str, connection):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _request(self, url: str, headers: Dict[str, str]):
+        import http.client
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        headers = {"User-Agent": "featbit-query", **headers}
+        while True:
+            connection, reused = self._acquire(parts.scheme, parts.netloc)
+            try:
+                connection.request("GET", path, headers=headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                if reused:
+                    continue  # the server dropped an idle keep-alive connection
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(parts.scheme, parts.netloc, connection)
+            return response, body
+
+    def __call__(self, url: str, headers: Dict[str, str]) -> FetchResponse:
+        from urllib.parse import urljoin
+
+        for _ in range(self.MAX_REDIRECTS + 1):
+            response, body = self._request(url, headers)
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                continue
+            if response.status >= 400:
+                raise FetchError(url, response.status)
+            return FetchResponse(response.status, dict(response.getheaders()), body)
+        raise FetchError(url, response.status)
+
+    def close(self):
+        """Close all idle pooled connections"""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+class PageCache:
+    """
+    On-disk documentation page cache
+
+    Entries are keyed by URL and stored as a body file plus a JSON metadata file.
+    Fresh entries (younger than ttl) are served without network access; stale
+    entries are revalidated with ETag/Last-Modified. The least recently used
+    entries are evicted once the cache exceeds max_bytes.
+    """
+
+    # SKILL.md: never serve cached documentation older than 24 hours
+    MAX_TTL = 24 * 3600
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl: float = 6 * 3600,
+                 max_bytes: int = 64 * 1024 * 1024, fetcher: Optional[Callable] = None):
+        """
+        Args:
+            cache_dir: Cache directory (defaults to $FEATBIT_CACHE_DIR or ~/.cache/featbit-docs)
+            ttl: Seconds an entry stays fresh without revalidation (at most MAX_TTL)
+            max_bytes: Total body size before LRU eviction
+            fetcher: Callable(url, headers) -> FetchResponse (defaults to HttpFetcher)
+        """
+        import os
+
+        if ttl > self.MAX_TTL:
+            raise ValueError(f"ttl must not exceed {self.MAX_TTL} seconds")
+        cache_dir = cache_dir or os.environ.get("FEATBIT_CACHE_DIR") or "~/.cache/featbit-docs"
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.fetcher = fetcher or HttpFetcher()
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url and body_path.exists() else None
+
+    def _write_meta(self, url: str, meta: Dict):
+        import os
+        import tempfile
+
+        _, meta_path = self._paths(url)
+        # Unique per writer: a timed-out fetch and its retry may both write this entry
+        fd, tmp_name = tempfile.mkstemp(prefix=meta_path.stem + ".", suffix=".tmp", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as stream:
+                stream.write(json.dumps(meta))
+            os.replace(tmp_name, meta_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+    def is_fresh(self, url: str) -> bool:
+        """Whether url is cached and younger than ttl"""
+        import time
+
+        meta = self._read_meta(url)
+        return meta is not None and time.time() - meta["fetched_at"] < self.ttl
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached content if fresh, otherwise None"""
+        if not self.is_fresh(url):
+            return None
+        return self._load(url)
+
+    def _load(self, url: str) -> Optional[str]:
+        """Return cached content, or None if the entry was evicted meanwhile"""
+        import os
+
+        body_path, _ = self._paths(url)
+        try:
+            os.utime(body_path)  # body mtime doubles as LRU access time
+            body = body_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        meta = self._read_meta(url) or {}
+        return body.decode(meta.get("charset") or "utf-8", errors="replace")
+
+    def put(self, url: str, body: bytes, headers: Dict[str, str]) -> str:
+        """
+        Store a fetched page and evict old entries if over max_bytes
+
+        The entry just written is never evicted, even when it alone exceeds max_bytes.
+
+        Returns:
+            The page content decoded with the response charset
+        """
+        import os
+        import threading
+        import time
+
+        headers = {name.lower(): value for name, value in headers.items()}
+        charset = None
+        content_type = headers.get("content-type", "")
+        if "charset=" in content_type:
+            charset = content_type.split("charset=", 1)[1].split(";")[0].strip()
+
+        body_path, _ = self._paths(url)
+        # Unique per writer, so concurrent fetches of one URL never share a partial file
+        tmp_path = body_path.with_suffix(f".{os.getpid()}-{threading.get_ident()}.part")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, body_path)
+        self._write_meta(url, {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "charset": charset,
+            "size": len(body),
+            "fetched_at": time.time(),
+        })
+        self.evict(keep=body_path)
+        return body.decode(charset or "utf-8", errors="replace")
+
+    def fetch(self, url: str) -> str:
+        """
+        Return page content, hitting the network only when the entry is missing or stale
+
+        Stale entries are revalidated with If-None-Match / If-Modified-Since;
+        a 304 response renews the entry without downloading the body again.
+        A freshly downloaded body is returned directly rather than read back,
+        so a concurrent eviction cannot lose it.
+        """
+        import time
+
+        meta = self._read_meta(url)
+        if meta and time.time() - meta["fetched_at"] < self.ttl:
+            content = self._load(url)
+            if content is not None:
+                return content
+            meta = None
+
+        headers = {}
+        if meta and meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.fetcher(url, headers)
+        if response.status == 304 and meta:
+            content = self._load(url)
+            if content is not None:
+                meta["fetched_at"] = time.time()
+                self._write_meta(url, meta)
+                return content
+            response = self.fetcher(url, {})  # evicted since the check: download it again
+
+        return self.put(url, response.body, response.headers)
+
+    def evict(self, keep: Optional[Path] = None):
+        """
+        Delete least recently used entries until total size fits max_bytes
+
+        Args:
+            keep: Body file that must survive (the entry being written)
+        """
+        entries = []
+        total = 0
+        for body_path in self.cache_dir.glob("*.body"):
+            try:
+                stat = body_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, body_path))
+            total += stat.st_size
+
+        for _, size, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if body_path == keep:
+                continue
+            body_path.unlink(missing_ok=True)
+            body_path.with_suffix(".json").unlink(missing_ok=True)
+            total -= size
+
+
+class AsyncPageFetcher:
+    """
+    Concurrent page fetcher
+
+    Fetches all pages at once on an asyncio event loop, running the blocking
+    fetcher (or the page cache) on a bounded thread pool, with a per-host
+    concurrency limit, a per-attempt timeout and retries with exponential backoff
+    for network errors and 5xx responses.
+    """
+
+    def __init__(self, fetcher: Optional[Callable] = None, cache: Optional[PageCache] = None,
+                 max_connections: int = 8, per_host: int = 4, timeout: float = 15.0,
+                 retries: int = 2, backoff: float = 0.5):
+        """
+        Args:
+            fetcher: Callable(url, headers) -> FetchResponse (defaults to HttpFetcher)
+            cache: Optional page cache; when given, pages are read through it with the cache's own fetcher
+            max_connections: Maximum fetches in flight
+            per_host: Maximum fetches in flight per host
+            timeout: Seconds per attempt
+            retries: Extra attempts after a failure
+            backoff: Initial retry delay in seconds, doubled per attempt
+
+        Raises:
+            ValueError: If both fetcher and cache are given
+        """
+        if fetcher is not None and cache is not None:
+            raise ValueError("Pass either fetcher or cache, not both: a cache fetches with its own fetcher")
+        self.cache = cache
+        self.fetcher = fetcher or (cache.fetcher if cache else HttpFetcher(timeout=timeout))
+        self.max_connections = max_connections
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def _fetch_blocking(self, url: str) -> str:
+        if self.cache is not None:
+            return self.cache.fetch(url)
+        response = self.fetcher(url, {})
+        return response.body.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def _retryable(error: Exception) -> bool:
+        """Network errors, timeouts, broken responses and 5xx statuses are worth another attempt"""
+        import asyncio
+        import http.client
+
+        if isinstance(error, FetchError):
+            return error.status >= 500
+        return isinstance(error, (OSError, http.client.HTTPException, asyncio.TimeoutError))
+
+    async def _fetch(self, url: str, executor, limits: Dict) -> Dict:
+        import asyncio
+        from urllib.parse import urlsplit
+
+        loop = asyncio.get_running_loop()
+        host = urlsplit(url).netloc
+        semaphore = limits.setdefault(host, asyncio.Semaphore(self.per_host))
+
+        def release(future):
+            # A timed-out attempt keeps its host slot until its thread really
+            # finishes, so retries never push a host over per_host
+            semaphore.release()
+            if not future.cancelled():
+                future.exception()  # retrieved, so a late failure is not logged
+
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                await semaphore.acquire()
+                future = loop.run_in_executor(executor, self._fetch_blocking, url)
+                future.add_done_callback(release)
+                content = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                return {"url": url, "content": content}
+            except Exception as e:
+                if not self._retryable(e) or attempt == self.retries:
+                    return {"url": url, "error": str(e) or type(e).__name__}
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def iter_pages(self, urls: Iterable[str]) -> AsyncIterator[Dict]:
+        """
+        Fetch urls concurrently, yielding each page as soon as it arrives
+
+        A failure of one page never affects the others. Attempts that time out
+        cannot be interrupted; they are left to finish in the background
+        instead of holding up the last page.
+
+        Yields:
+            {url, content} on success or {url, error} after the last failed attempt
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+
+        limits: Dict = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_connections)
+        try:
+            tasks = [asyncio.ensure_future(self._fetch(url, executor, limits)) for url in dict.fromkeys(urls)]
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stream(self, urls: Iterable[str]) -> Iterator[Dict]:
+        """
+        Synchronous view of iter_pages for non-async callers
+
+        The event loop runs on a background thread and pages are handed over
+        as they complete, so a consumer such as format_answer_prompt can start
+        on the first page while the rest are still downloading. An unexpected
+        error on that thread is re-raised here.
+        """
+        import asyncio
+        import queue
+        import threading
+
+        pages: "queue.Queue" = queue.Queue()
+        done = object()
+        failure: List[BaseException] = []
+
+        async def produce():
+            async for page in self.iter_pages(urls):
+                pages.put(page)
+
+        def run():
+            try:
+                asyncio.run(produce())
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                pages.put(done)
+
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            page = pages.get()
+            if page is done:
+                if failure:
+                    raise failure[0]
+                return
+            yield page
+
+    def fetch_all(self, urls: Iterable[str]) -> List[Dict]:
+        """Fetch urls concurrently and return pages in completion order"""
+        return list(self.stream(urls))
+
+
+class PromptBuilder:
+    """
+    Answer prompt assembled from a list of parts
+
+    Documents are added one at a time (e.g. as they are fetched) and kept
+    within an optional character budget: each document is truncated at a line
+    boundary to whatever budget remains, and later documents are omitted once
+    it is spent. report records how much of each document was kept.
+    """
+
+    # Rough token estimate used when a budget is given in tokens
+    CHARS_PER_TOKEN = 4
+
+    HEADER = """Please answer the question based on the following FeatBit official documentation content.
+
+Question: {question}
+
+Official Documentation Content:
+
+"""
+
+    FOOTER = """
+Answer requirements:
+1. Answer in English (or match question language)
+2. Provide direct answer, do not repeat the question
+3. If code is involved, provide runnable code examples
+4. Must attach source links at the end of answer
+5. If no answer in docs, say "information not found in official documentation"
+"""
+
+    def __init__(self, question: str, max_chars: Optional[int] = None, max_tokens: Optional[int] = None,
+                 max_doc_chars: Optional[int] = None, chunking: bool = True):
+        """
+        Args:
+            question: Original question
+            max_chars: Character budget for the whole prompt
+            max_tokens: Token budget for the whole prompt (converted with CHARS_PER_TOKEN)
+            max_doc_chars: Character budget for each document
+            chunking: Reduce over-budget documents to their most relevant sections
+                (see select_chunks) instead of keeping only their beginning
+        """
+        if max_tokens is not None:
+            token_chars = max_tokens * self.CHARS_PER_TOKEN
+            max_chars = token_chars if max_chars is None else min(max_chars, token_chars)
+        self.question = question
+        self.max_doc_chars = max_doc_chars
+        self.chunking = chunking
+        self.parts: List[str] = [self.HEADER.format(question=question)]
+        self.report: List[Dict] = []
+        self._documents = 0
+        self._remaining = None if max_chars is None else max_chars - len(self.parts[0]) - len(self.FOOTER)
+
+    def _fit(self, content: str, limit: int) -> Tuple[str, Optional[List[str]]]:
+        """Return the part of content to keep within limit characters, and the kept section headings"""
+        if self.chunking:
+            chunks = select_chunks(self.question, content, limit)
+            if chunks:
+                return "\n\n".join(chunk.text for chunk in chunks), [chunk.heading for chunk in chunks]
+        cut = content.rfind("\n", 0, limit)
+        return content[:cut if cut > limit // 2 else limit], None
+
+    def add_document(self, url: str, content: Optional[str] = None, error: Optional[str] = None) -> Dict:
+        """
+        Append one document within the remaining budget
+
+        Returns:
+            Report entry {url, chars, kept_chars, truncated}, plus {sections} listing
+            the kept headings when the document was reduced by chunk selection
+        """
+        heading = f"\n## Document {self._documents + 1}: {url}\n\n"
+        body = f"(Fetch failed: {error})" if error is not None else (content or "")
+        entry = {"url": url, "chars": len(body), "kept_chars": len(body), "truncated": False}
+        self.report.append(entry)
+
+        overhead = len(heading) + len("\n\n---\n")
+        limit = self.max_doc_chars
+        if self._remaining is not None:
+            available = self._remaining - overhead
+            limit = available if limit is None else min(limit, available)
+        if limit is not None and len(body) > limit:
+            marker = f"\n\n[... reduced from {len(body)} chars to fit the prompt budget]"
+            if limit <= len(marker):
+                entry.update(kept_chars=0, truncated=True)
+                return entry
+            kept, sections = self._fit(body, limit - len(marker))
+            entry.update(kept_chars=len(kept), truncated=True)
+            if sections is not None:
+                entry["sections"] = sections
+            body = kept + marker
+        if self._remaining is not None:
+            self._remaining -= overhead + len(body)
+
+        self._documents += 1
+        self.parts += [heading, body, "\n\n", "---\n"]
+        return entry
+
+    def build(self) -> str:
+        """Join the parts into the final prompt"""
+        return "".join(self.parts + [self.FOOTER])
+
+    def write(self, out: TextIO):
+        """Write the prompt to a stream without building it in memory"""
+        out.writelines(self.parts)
+        out.write(self.FOOTER)
+
+
 class FeatBitAnswer:
     """FeatBit Q&A Assistant"""
 
-    def __init__(self):
+    def __init__(self, cache: Optional[PageCache] = None):
+        """
+        Args:
+            cache: Optional page cache; when given, ask() reports per-page freshness
+        """
         self.finder = FeatBitDocFinder()
+        self.cache = cache
 
-    def ask(self, question: str) -> Dict:
+    def ask(self, question: str, top_k: Optional[int] = None) -> Dict:
         """
         Answer question
 
         Args:
             question: User question
+            top_k: Return up to top_k BM25-ranked pages instead of first-match routing
 
         Returns:
-            Answer dictionary containing question, pages, fetch_needed
+            Answer dictionary containing question, pages, fetch_needed; with a cache,
+            each page also carries {cached, fetch_needed}
+
+        Raises:
+            ValueError: If top_k is given and less than 1
         """
         # 1. Find relevant pages
-        pages = self.finder.find_pages(question)
+        if top_k is not None:
+            pages = self.finder.search(question, top_k)
+        else:
+            pages = self.finder.find_pages(question)
+
+        # 2. Mark pages already fresh in the cache
+        fetch_needed = True
+        if self.cache is not None:
+            for page in pages:
+                page["cached"] = self.cache.is_fresh(page["url"])
+                page["fetch_needed"] = not page["cached"]
+            fetch_needed = any(page["fetch_needed"] for page in pages)
 
-        # 2. Return fetch instructions
+        # 3. Return fetch instructions
         return {
             "question": question,
             "pages": pages,
-            "fetch_needed": True,
+            "fetch_needed": fetch_needed,
             "timestamp": datetime.now().isoformat()
         }
 
-    def format_answer_prompt(self, question: str, page_contents: List[Dict]) -> str:
+    def ask_many(self, questions: Iterable[str], top_k: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Answer many questions, streaming one result per question
+
+        Args:
+            questions: Iterable of user questions (consumed lazily)
+            top_k: Passed through to ask()
+
+        Returns:
+            Iterator of answer dictionaries, same shape as ask()
+        """
+        for question in questions:
+            yield self.ask(question, top_k)
+
+    def fetch_prompt(self, question: str, top_k: Optional[int] = None,
+                     fetcher: Optional[AsyncPageFetcher] = None,
+                     max_tokens: Optional[int] = None,
+                     max_doc_tokens: Optional[int] = None) -> PromptBuilder:
+        """
+        Route question, fetch its pages concurrently and build the answer prompt
+
+        Args:
+            question: User question
+            top_k: Passed through to ask()
+            fetcher: Page fetcher (defaults to AsyncPageFetcher over this assistant's cache)
+            max_tokens: Token budget for the prompt
+            max_doc_tokens: Token budget per document
+
+        Returns:
+            PromptBuilder holding the prompt (documents in arrival order) and its report
+        """
+        result = self.ask(question, top_k)
+        fetcher = fetcher or AsyncPageFetcher(cache=self.cache)
+        urls = [page["url"] for page in result["pages"]]
+        return self.build_answer_prompt(question, fetcher.stream(urls), max_tokens=max_tokens,
+                                        max_doc_tokens=max_doc_tokens)
+
+    def build_answer_prompt(self, question: str, page_contents: Iterable[Dict],
+                            max_chars: Optional[int] = None,
+                            max_tokens: Optional[int] = None,
+                            max_doc_tokens: Optional[int] = None) -> PromptBuilder:
+        """
+        Assemble the answer prompt within an optional budget
+
+        Over-budget documents are reduced to their sections most relevant to the
+        question (see select_chunks), falling back to their beginning.
+
+        Args:
+            question: Original question
+            page_contents: Iterable of fetched page contents, each containing {url, content}
+                or {url, error} for pages that could not be fetched
+            max_chars: Character budget for the whole prompt
+            max_tokens: Token budget for the whole prompt
+            max_doc_tokens: Token budget for each document
+
+        Returns:
+            PromptBuilder; call build() or write() for the prompt, read report for per-document coverage
+        """
+        max_doc_chars = max_doc_tokens * PromptBuilder.CHARS_PER_TOKEN if max_doc_tokens else None
+        builder = PromptBuilder(question, max_chars=max_chars, max_tokens=max_tokens, max_doc_chars=max_doc_chars)
+        for content in page_contents:
+            builder.add_document(content["url"], content.get("content"), content.get("error"))
+        return builder
+
+    def format_answer_prompt(self, question: str, page_contents: Iterable[Dict],
+                             max_tokens: Optional[int] = None) -> str:
         """
         Format answer prompt
 
         Args:
             question: Original question
-            page_contents: List of fetched page contents, each containing {url, content}
+            page_contents: Iterable of fetched page contents, each containing {url, content}
+                or {url, error} for pages that could not be fetched
+            max_tokens: Optional token budget; documents are reduced to fit
 
         Returns:
             Prompt for LLM
 
-        Note: page_contents need to be fetched first using any method (webReader MCP / requests / browser)
+        Note: page_contents can come from fetch_prompt()/AsyncPageFetcher or any other method
+        (webReader MCP / requests / browser)
         """
-        prompt = f"""Please answer the question based on the following FeatBit official documentation content.
+        return self.build_answer_prompt(question, page_contents, max_tokens=max_tokens).build()
 
-Question: {question}
 
-Official Documentation Content:
+def read_batch(stream: TextIO) -> Iterator[Dict]:
+    """
+    Read batch questions from a JSON-lines stream
 
-"""
-        for i, content in enumerate(page_contents, 1):
-            prompt += f"\n## Document {i}: {content['url']}\n\n"
-            prompt += f"{content['content']}\n\n"
-            prompt += "---\n"
+    Each non-empty line is either a JSON object with a "question" field (other
+    fields such as "id" are passed through), a JSON string, or plain text.
 
-        prompt += """
-Answer requirements:
-1. Answer in English (or match question language)
-2. Provide direct answer, do not repeat the question
-3. If code is involved, provide runnable code examples
-4. Must attach source links at the end of answer
-5. If no answer in docs, say "information not found in official documentation"
-"""
-        return prompt
+    Args:
+        stream: Text stream to read line by line
+
+    Returns:
+        Iterator of records, each containing at least {question}
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = line
+        if isinstance(record, dict) and isinstance(record.get("question"), str):
+            yield record
+        elif isinstance(record, str):
+            yield {"question": record}
+        else:
+            yield {"question": line}
+
+
+def run_batch(stream: TextIO, out: TextIO, top_k: Optional[int] = None,
+              assistant: Optional["FeatBitAnswer"] = None):
+    """
+    Route every question from stream and write one JSON result per line to out
+
+    Input is consumed lazily so memory stays flat regardless of input size.
+    """
+    assistant = assistant or FeatBitAnswer()
+    for record in read_batch(stream):
+        result = assistant.ask(record["question"], top_k)
+        for key, value in record.items():
+            result.setdefault(key, value)
+        out.write(json.dumps(result, ensure_ascii=False))
+        out.write("\n")
+
+
+def handle_rpc(request: Dict, assistant: "FeatBitAnswer") -> Dict:
+    """
+    Handle one JSON-RPC 2.0 request against a warm assistant
+
+    Supported methods: ask {question, top_k?}, find_pages {question}, search {question, top_k?}, ping
+
+    Invalid params get error -32602 and unexpected failures -32603, so one bad
+    request never stops the serving loop.
+
+    Returns:
+        JSON-RPC response dictionary
+    """
+    request_id = request.get("id") if isinstance(request, dict) else None
+    response = {"jsonrpc": "2.0", "id": request_id}
+    if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+        response["error"] = {"code": -32600, "message": "Invalid request"}
+        return response
+
+    params = request.get("params") or {}
+    method = request["method"]
+    try:
+        if method == "ping":
+            response["result"] = "pong"
+        elif method in ("ask", "find_pages", "search"):
+            question = params.get("question") if isinstance(params, dict) else None
+            top_k = params.get("top_k") if isinstance(params, dict) else None
+            if not isinstance(question, str):
+                response["error"] = {"code": -32602, "message": "Missing 'question' parameter"}
+            elif top_k is not None and (not isinstance(top_k, int) or isinstance(top_k, bool) or top_k < 1):
+                response["error"] = {"code": -32602, "message": "'top_k' must be a positive integer"}
+            elif method == "ask":
+                response["result"] = assistant.ask(question, top_k)
+            elif method == "search":
+                response["result"] = assistant.finder.search(question, top_k or 3)
+            else:
+                response["result"] = assistant.finder.find_pages(question)
+        else:
+            response["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+    except Exception as e:
+        # Keep the daemon alive: report the failure to this caller only
+        response.pop("result", None)
+        response["error"] = {"code": -32603, "message": f"Internal error: {e}"}
+    return response
+
+
+def serve_stream(stream: TextIO, out: TextIO, assistant: Optional["FeatBitAnswer"] = None):
+    """
+    Serve newline-delimited JSON-RPC requests from stream, one response line each
+    """
+    assistant = assistant or FeatBitAnswer()
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            response = handle_rpc(json.loads(line), assistant)
+        except ValueError:
+            response = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+        out.write(json.dumps(response, ensure_ascii=False))
+        out.write("\n")
+        out.flush()
+
+
+def serve_socket(path: str, assistant: Optional["FeatBitAnswer"] = None):
+    """
+    Serve JSON-RPC over a local Unix socket until interrupted
+
+    Each connection may send any number of newline-delimited requests.
+
+    Raises:
+        FileExistsError: If a daemon is already listening on path
+    """
+    import io
+    import os
+    import socket
+    import socketserver
+
+    assistant = assistant or FeatBitAnswer()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            stream = io.TextIOWrapper(self.rfile, encoding="utf-8")
+            out = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+            serve_stream(stream, out, assistant)
+
+    if os.path.exists(path):
+        # Only a socket nobody answers on was left behind by a daemon that exited
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+        else:
+            raise FileExistsError(f"A query daemon is already listening on {path}")
+        finally:
+            probe.close()
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        server.daemon_threads = True
+        print(f"FeatBit query daemon listening on {path}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    import argparse
+
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value!r}")
+    return number
 
 
 def main():
     """Command line entry"""
     import argparse
-    import json
 
     parser = argparse.ArgumentParser(description="FeatBit Documentation Query")
     parser.add_argument("question", nargs="?", help="Your question")
     parser.add_argument("--list-pages", action="store_true", help="List all documentation pages")
     parser.add_argument("--json", action="store_true", help="Output in JSON format")
+    parser.add_argument("--route", action="store_true",
+                        help="Print only the matched pages as one compact JSON line")
+    parser.add_argument("--compile", action="store_true",
+                        help=f"Compile references/{ROUTING_FILE} from the reference markdown tables")
+    parser.add_argument("--top-k", type=_positive_int, metavar="K",
+                        help="Return up to K BM25-ranked pages instead of first-match routing")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Route JSON-lines questions from FILE ('-' for stdin), streaming JSON lines out")
+    parser.add_argument("--serve", action="store_true",
+                        help="Run as a warm routing daemon speaking JSON-RPC (stdin/stdout unless --socket)")
+    parser.add_argument("--socket", metavar="PATH", help="Unix socket path for --serve")
+    parser.add_argument("--fetch", action="store_true",
+                        help="Fetch the matched pages concurrently and print the answer prompt")
+    parser.add_argument("--max-tokens", type=int, metavar="N",
+                        help="Token budget for the --fetch prompt; documents are reduced to fit")
+    parser.add_argument("--max-doc-tokens", type=int, metavar="N",
+                        help="Token budget per --fetch document; keeps the sections most relevant to the question")
+    parser.add_argument("--cache-dir", metavar="DIR",
+                        help="Page cache directory; pages fresh in cache are reported as not needing a fetch")
 
     args = parser.parse_args()
 
+    if args.compile:
+        routing = compile_routing()
+        path = REFERENCES_DIR / ROUTING_FILE
+        path.write_text(json.dumps(routing, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+        pages = sum(len(entries) for entries in routing["pages"].values())
+        print(f"Compiled {pages} pages and {len(routing['keywords'])} keyword groups to {path}")
+        return
+
+    assistant = FeatBitAnswer(PageCache(args.cache_dir) if args.cache_dir else None)
+
+    if args.serve:
+        import sys
+
+        if args.socket:
+            try:
+                serve_socket(args.socket, assistant)
+            except FileExistsError as error:
+                sys.exit(str(error))
+        else:
+            serve_stream(sys.stdin, sys.stdout, assistant)
+        return
+
+    if args.batch:
+        import sys
+
+        if args.batch == "-":
+            run_batch(sys.stdin, sys.stdout, args.top_k, assistant)
+        else:
+            with open(args.batch, encoding="utf-8") as stream:
+                run_batch(stream, sys.stdout, args.top_k, assistant)
+        return
+
     if args.list_pages:
         pages = FeatBitDocFinder.get_all_pages()
         print(f"Total {len(pages)} documentation pages:\n")
@@ -250,9 +1525,23 @@ def main():
         parser.print_help()
         return
 
+    if args.fetch:
+        import sys
+
+        builder = assistant.fetch_prompt(args.question, args.top_k, max_tokens=args.max_tokens,
+                                         max_doc_tokens=args.max_doc_tokens)
+        builder.write(sys.stdout)
+        for entry in builder.report:
+            print(f"{entry['url']}: kept {entry['kept_chars']}/{entry['chars']} chars", file=sys.stderr)
+        return
+
     # Query
-    assistant = FeatBitAnswer()
-    result = assistant.ask(args.question)
+    result = assistant.ask(args.question, args.top_k)
+
+    if args.route:
+        pages = [{"url": page["url"], "category": page["category"]} for page in result["pages"]]
+        print(json.dumps(pages, ensure_ascii=False, separators=(",", ":")))
+        return
 
     if args.json:
         print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -261,8 +1550,12 @@ def main():
         print(f"Need to fetch {len(result['pages'])} pages:\n")
 
         for i, page in enumerate(result['pages'], 1):
-            print(f"{i}. [{page['category']}] {page['url']}")
-            print(f"   Reason: {page['reason']}\n")
+            cached = " (fresh in cache)" if page.get("cached") else ""
+            print(f"{i}. [{page['category']}] {page['url']}{cached}")
+            print(f"   Reason: {page['reason']}")
+            if "score" in page:
+                print(f"   Score: {page['score']}")
+            print()
 
         print("\nNext steps:")
         print("1. Use webReader MCP, requests, or browser to visit the above URLs")
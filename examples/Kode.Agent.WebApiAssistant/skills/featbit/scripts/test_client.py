@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for QueryClient against a stand-in routing daemon
+
+Usage:
+    python -m unittest discover -s scripts
+"""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+import unittest
+
+from client import QueryClient
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """
+    Echoes each request's params back as its result. The server's mode changes that:
+    "slow"       answers after a delay longer than the client timeout
+    "wrong-id"   answers with another request's id
+    """
+
+    def handle(self):
+        self.server.connections.add(self.connection)
+        try:
+            for line in self.rfile:
+                request = json.loads(line)
+                mode = self.server.mode
+                if mode == "slow":
+                    time.sleep(0.3)
+                request_id = request["id"] + 100 if mode == "wrong-id" else request["id"]
+                response = {"jsonrpc": "2.0", "id": request_id, "result": request["params"]}
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+        finally:
+            self.server.connections.discard(self.connection)
+
+
+class QueryClientTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "daemon.sock")
+        self.server = None
+        self.start_daemon()
+        self.client = QueryClient(self.path, timeout=0.1)
+
+    def tearDown(self):
+        self.client.close()
+        self.stop_daemon()
+        self._tmp.cleanup()
+
+    def start_daemon(self, mode="ok"):
+        self.server = socketserver.ThreadingUnixStreamServer(self.path, _DaemonHandler)
+        self.server.daemon_threads = True
+        self.server.mode = mode
+        self.server.connections = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop_daemon(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            # Like a daemon exiting: drop the connections it was still serving
+            for connection in list(self.server.connections):
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # already closed by its handler
+            os.unlink(self.path)
+            self.server = None
+
+    def test_call_returns_result(self):
+        self.assertEqual(self.client.call("ask", question="a"), {"question": "a"})
+        self.assertEqual(self.client.call("ask", question="b"), {"question": "b"})
+
+    def test_timeout_does_not_leak_reply_into_next_call(self):
+        self.server.mode = "slow"
+        with self.assertRaises(OSError):
+            self.client.call("ask", question="late")
+        self.server.mode = "ok"
+        time.sleep(0.3)
+        self.assertEqual(self.client.call("ask", question="next"), {"question": "next"})
+
+    def test_mismatched_response_id_is_rejected(self):
+        self.server.mode = "wrong-id"
+        with self.assertRaises(ConnectionError):
+            self.client.call("ask", question="a")
+        self.assertIsNone(self.client._sock)
+
+    def test_reconnects_after_daemon_restart(self):
+        self.client.call("ask", question="a")
+        self.stop_daemon()
+        self.start_daemon()
+        self.assertEqual(self.client.call("ask", question="b"), {"question": "b"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Tests for query.py: AsyncPageFetcher against a local stand-in documentation server, and top_k checks
+
+Usage:
+    python -m unittest discover -s scripts
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from query import AsyncPageFetcher, FeatBitAnswer, FetchError, HttpFetcher, PageCache
+
+
+class _DocHandler(BaseHTTPRequestHandler):
+    """
+    /ok/*     200 with a small page
+    /slow     200 after a delay longer than the test timeout
+    /flaky    500 on the first request, 200 afterwards
+    /missing  404
+    /broken   promises more bytes than it sends (IncompleteRead)
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, length=None):
+        self.send_response(status)
+        self.send_header("Content-Length", str(length if length is not None else len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.started.setdefault(self.path, []).append(time.monotonic())
+            hits = server.hits[self.path]
+        if self.path.startswith("/ok/"):
+            self._send(200, f"# Page {self.path}\n".encode())
+        elif self.path == "/slow":
+            time.sleep(server.slow_delay)
+            self._send(200, b"# Slow\n")
+        elif self.path == "/flaky":
+            self._send(500 if hits == 1 else 200, b"# Flaky\n")
+        elif self.path == "/missing":
+            self._send(404, b"not found")
+        elif self.path == "/broken":
+            self._send(200, b"# Broken", length=1000)
+            self.close_connection = True
+
+
+class AsyncPageFetcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _DocHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.hits = {}
+        self.server.started = {}
+        self.server.slow_delay = 1.0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch_all(self, paths, **options):
+        options.setdefault("backoff", 0.01)
+        fetcher = AsyncPageFetcher(fetcher=options.pop("fetcher", None) or HttpFetcher(timeout=5), **options)
+        return {page["url"][len(self.base):]: page for page in fetcher.fetch_all(self.base + path for path in paths)}
+
+    def test_fetches_every_page(self):
+        pages = self.fetch_all([f"/ok/{i}" for i in range(5)])
+        self.assertEqual(len(pages), 5)
+        self.assertEqual(pages["/ok/3"]["content"], "# Page /ok/3\n")
+
+    def test_timeout_returns_error_without_waiting_for_the_hung_request(self):
+        start = time.perf_counter()
+        pages = self.fetch_all(["/slow", "/ok/1"], timeout=0.2, retries=0)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(pages["/slow"]["error"], "TimeoutError")
+        self.assertIn("content", pages["/ok/1"])
+        self.assertLess(elapsed, self.server.slow_delay)
+
+    def test_timed_out_attempt_keeps_its_host_slot(self):
+        # With one slot per host the retry waits for the hung attempt instead of running beside it
+        self.server.slow_delay = 0.4
+        pages = self.fetch_all(["/slow"], timeout=0.1, retries=1, per_host=1)
+        self.assertEqual(pages["/slow"]["error"], "TimeoutError")
+        first, second = self.server.started["/slow"]
+        self.assertGreaterEqual(second - first, self.server.slow_delay)
+
+    def test_retries_server_errors(self):
+        pages = self.fetch_all(["/flaky"], retries=2)
+        self.assertEqual(pages["/flaky"]["content"], "# Flaky\n")
+        self.assertEqual(self.server.hits["/flaky"], 2)
+
+    def test_client_errors_are_not_retried(self):
+        pages = self.fetch_all(["/missing"], retries=2)
+        self.assertIn("HTTP 404", pages["/missing"]["error"])
+        self.assertEqual(self.server.hits["/missing"], 1)
+
+    def test_broken_response_does_not_hide_other_pages(self):
+        pages = self.fetch_all(["/ok/1", "/broken", "/ok/2"], retries=1)
+        self.assertEqual(len(pages), 3)
+        self.assertIn("error", pages["/broken"])
+        self.assertEqual(self.server.hits["/broken"], 2)
+        self.assertIn("content", pages["/ok/1"])
+        self.assertIn("content", pages["/ok/2"])
+
+    def test_unexpected_fetcher_error_is_reported_per_page(self):
+        http = HttpFetcher(timeout=5)
+
+        def fetcher(url, headers):
+            if url.endswith("/bad"):
+                raise ValueError("malformed page")
+            return http(url, headers)
+
+        pages = self.fetch_all(["/ok/1", "/bad", "/ok/2"], fetcher=fetcher, retries=2)
+        self.assertEqual(pages["/bad"]["error"], "malformed page")
+        self.assertIn("content", pages["/ok/1"])
+        self.assertIn("content", pages["/ok/2"])
+
+    def test_fetcher_and_cache_are_exclusive(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with self.assertRaises(ValueError):
+                AsyncPageFetcher(fetcher=HttpFetcher(), cache=PageCache(cache_dir))
+
+    def test_retryable(self):
+        self.assertTrue(AsyncPageFetcher._retryable(FetchError("u", 503)))
+        self.assertFalse(AsyncPageFetcher._retryable(FetchError("u", 403)))
+        self.assertTrue(AsyncPageFetcher._retryable(ConnectionResetError()))
+        self.assertFalse(AsyncPageFetcher._retryable(KeyError("x")))
+
+
+class TopKTest(unittest.TestCase):
+
+    def test_top_k_must_be_positive(self):
+        assistant = FeatBitAnswer()
+        for top_k in (0, -1):
+            with self.assertRaises(ValueError):
+                assistant.ask("How to integrate .NET SDK", top_k)
+            with self.assertRaises(ValueError):
+                assistant.finder.search("How to integrate .NET SDK", top_k)
+
+    def test_top_k_limits_ranked_pages(self):
+        pages = FeatBitAnswer().ask("How to integrate .NET SDK", 2)["pages"]
+        self.assertEqual(len(pages), 2)
+        self.assertIn("score", pages[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
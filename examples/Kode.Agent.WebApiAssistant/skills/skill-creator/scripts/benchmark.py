@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+"""
+Skill Tooling Benchmarks - Measures package_skill.py and quick_validate.py performance
+
+Usage:
+    python benchmark.py compress [--size-mb N] [--files N] [--workers 1,2,4,8]
+    python benchmark.py incremental [--size-mb N] [--files N]
+    python benchmark.py mixed [--size-mb N]
+    python benchmark.py output [--files N]
+    python benchmark.py index [--archives N] [--files N]
+    python benchmark.py install [--archives N] [--size-mb N] [--files N] [--jobs N]
+    python benchmark.py validate [--root SKILLS_ROOT] [--copies N]
+    python benchmark.py frontmatter [--body-mb 1,8,64]
+    python benchmark.py parse [--root SKILLS_ROOT] [--rounds N]
+    python benchmark.py deep [--files 1000,10000,50000]
+    python benchmark.py large [--size-gb 4.5] [--stored] [--max-rss-mb 256]
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from frontmatter import parse_frontmatter, read_frontmatter, read_frontmatter_text
+from install_skill import install_all
+from package_skill import collect_files, package_skill, write_skill_archive
+from quick_validate import ValidationCache, validate_all, validate_skill
+from skill_archive import (
+    ZIP_LZMA, CompressionPolicy, PreviousBuild, SkillArchiveWriter, compress_files, manifest_path_for, read_index,
+    write_manifest,
+)
+from skill_ignore import discover_skills
+from skill_reporter import ConsoleReporter, JsonReporter, ProgressReporter, QuietReporter
+from skill_resources import check_resources, skill_md_references
+
+
+def make_synthetic_skill(root, size_mb, files):
+    """
+    Create a skill folder with SKILL.md and `files` compressible data files totalling size_mb.
+
+    Returns:
+        Path to the skill folder
+    """
+    skill = Path(root) / "synthetic-skill"
+    (skill / "assets").mkdir(parents=True, exist_ok=True)
+    (skill / "SKILL.md").write_text("---\nname: synthetic-skill\ndescription: Benchmark skill\n---\n\n# Synthetic\n")
+    rng = random.Random(0)
+    words = [bytes(rng.choice(b"abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10))) for _ in range(5000)]
+    block = b" ".join(rng.choice(words) for _ in range(200_000))
+    per_file = size_mb * 1024 * 1024 // files
+    for i in range(files):
+        with open(skill / "assets" / f"data-{i:04d}.txt", "wb") as f:
+            remaining = per_file
+            while remaining > 0:
+                chunk = block[:remaining]
+                f.write(chunk)
+                remaining -= len(chunk)
+    return skill
+
+
+def make_mixed_skill(root, size_mb):
+    """
+    Create a skill folder of roughly size_mb: 30% text, 40% PNG-like images,
+    15% random binary without a known extension and 15% zip archives.
+
+    Returns:
+        Path to the skill folder
+    """
+    skill = Path(root) / "mixed-skill"
+    for folder in ("references", "assets", "data"):
+        (skill / folder).mkdir(parents=True, exist_ok=True)
+    (skill / "SKILL.md").write_text("---\nname: mixed-skill\ndescription: Benchmark skill\n---\n\n# Mixed\n")
+    rng = random.Random(0)
+    words = [bytes(rng.choice(b"abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10))) for _ in range(5000)]
+    text = b" ".join(rng.choice(words) for _ in range(200_000))
+    mb = 1024 * 1024
+    for i in range(max(1, size_mb * 3 // 10)):
+        (skill / "references" / f"guide-{i:03d}.md").write_bytes(text[:mb])
+    for i in range(max(1, size_mb * 4 // 10)):
+        (skill / "assets" / f"image-{i:03d}.png").write_bytes(rng.randbytes(mb))
+    for i in range(max(1, size_mb * 15 // 100)):
+        (skill / "data" / f"blob-{i:03d}.bin").write_bytes(rng.randbytes(mb))
+    for i in range(max(1, size_mb * 15 // 100)):
+        with zipfile.ZipFile(skill / "assets" / f"bundle-{i:03d}.zip", "w", zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr("notes.txt", text * 4)
+    return skill
+
+
+def _skill_files(skill):
+    return sorted(
+        (path, path.relative_to(skill.parent).as_posix())
+        for path in skill.rglob("*")
+        if path.is_file()
+    )
+
+
+def bench_compress(args):
+    """Serial zipfile packaging vs the parallel engine at several worker counts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = make_synthetic_skill(tmp, args.size_mb, args.files)
+        files = _skill_files(skill)
+        total = sum(path.stat().st_size for path, _ in files)
+        output = Path(tmp) / "out.skill"
+
+        def report(name, elapsed):
+            print(f"{name:<22} {elapsed:8.2f} s {total / elapsed / 2 ** 20:9.1f} MB/s")
+
+        print(f"{len(files)} files, {total / 2 ** 20:.0f} MB, {os.cpu_count()} CPUs")
+        start = time.perf_counter()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for path, arcname in files:
+                zipf.write(path, arcname)
+        report("zipfile (serial)", time.perf_counter() - start)
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            with open(output, "wb") as f:
+                writer = SkillArchiveWriter(f)
+                for member in compress_files(files, workers):
+                    writer.write(member)
+                writer.close()
+            report(f"parallel, {workers} workers", time.perf_counter() - start)
+
+
+def _build(files, output, incremental):
+    tmp_output = output.with_name(output.name + ".tmp")
+    previous = PreviousBuild(output) if incremental else None
+    with open(tmp_output, "wb") as f:
+        writer = SkillArchiveWriter(f)
+        for member in compress_files(files, reuse=previous.reuse if previous else None):
+            writer.write(member)
+        writer.close()
+    if previous:
+        previous.close()
+    os.replace(tmp_output, output)
+    write_manifest(manifest_path_for(output), writer.members)
+    return sum(1 for member in writer.members if member.reused)
+
+
+def bench_incremental(args):
+    """Full rebuild vs incremental rebuild after editing SKILL.md"""
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = make_synthetic_skill(tmp, args.size_mb, args.files)
+        files = _skill_files(skill)
+        output = Path(tmp) / "out.skill"
+        print(f"{len(files)} files, {args.size_mb} MB")
+
+        start = time.perf_counter()
+        _build(files, output, incremental=False)
+        print(f"{'full build':<28} {time.perf_counter() - start:8.2f} s")
+
+        with open(skill / "SKILL.md", "a") as f:
+            f.write("\nEdited.\n")
+        start = time.perf_counter()
+        reused = _build(files, output, incremental=True)
+        print(f"{'incremental, SKILL.md edited':<28} {time.perf_counter() - start:8.2f} s ({reused} reused)")
+
+        for path, _ in files:
+            os.utime(path)  # e.g. a fresh CI checkout: same content, new mtimes
+        start = time.perf_counter()
+        reused = _build(files, output, incremental=True)
+        print(f"{'incremental, all touched':<28} {time.perf_counter() - start:8.2f} s ({reused} reused)")
+
+        with zipfile.ZipFile(output) as zipf:
+            assert zipf.testzip() is None
+
+
+def bench_mixed(args):
+    """Archive size and CPU time per compression policy over a mixed-asset skill"""
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = make_mixed_skill(tmp, args.size_mb)
+        files = _skill_files(skill)
+        total = sum(path.stat().st_size for path, _ in files)
+        output = Path(tmp) / "out.skill"
+        print(f"{len(files)} files, {total / 2 ** 20:.0f} MB, 1 worker")
+        print(f"{'policy':<28} {'s':>7} {'archive MB':>11} {'stored':>7}")
+
+        start = time.perf_counter()
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zipf:
+            for path, arcname in files:
+                zipf.write(path, arcname)
+        print(f"{'zipfile, deflate all':<28} {time.perf_counter() - start:>7.2f} "
+              f"{output.stat().st_size / 2 ** 20:>11.1f} {0:>7}")
+
+        policies = [
+            ("deflate all", CompressionPolicy(stored_extensions=(), probe=False)),
+            ("default policy", CompressionPolicy()),
+            ("default, text level 9", CompressionPolicy(text_level=9)),
+            ("default, text lzma", CompressionPolicy(text_method=ZIP_LZMA)),
+        ]
+        for name, policy in policies:
+            start = time.perf_counter()
+            with open(output, "wb") as f:
+                writer = SkillArchiveWriter(f)
+                for member in compress_files(files, 1, policy):
+                    writer.write(member)
+                writer.close()
+            elapsed = time.perf_counter() - start
+            stored = sum(1 for member in writer.members if member.compress_type == 0)
+            print(f"{name:<28} {elapsed:>7.2f} {output.stat().st_size / 2 ** 20:>11.1f} {stored:>7}")
+
+
+def make_many_files_skill(root, files):
+    """Create a skill folder with `files` small text files spread over 100 folders"""
+    skill = Path(root) / "many-files-skill"
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: many-files-skill\ndescription: Benchmark skill\n---\n")
+    body = b"lorem ipsum dolor sit amet " * 40
+    for i in range(files):
+        folder = skill / "references" / f"part-{i % 100:03d}"
+        if i < 100:
+            folder.mkdir(parents=True)
+        (folder / f"doc-{i:06d}.md").write_bytes(body)
+    return skill
+
+
+class PerFilePrintReporter(ConsoleReporter):
+    """The previous behaviour: print "Added: ..." from inside the packaging loop"""
+
+    def file_done(self, member):
+        print(f"  {'Reused' if member.reused else 'Added'}: {member.arcname}")
+
+    def end(self, members):
+        pass
+
+
+def bench_output(args):
+    """
+    Packaging time with each output mode. Output goes to stdout, so run it in a
+    terminal (or redirect stdout) to include the cost of the console; the table
+    is printed to stderr.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = make_many_files_skill(tmp, args.files)
+        files = collect_files(skill)
+        modes = [
+            ("print per file (before)", PerFilePrintReporter),
+            ("default", ConsoleReporter),
+            ("--verbose", lambda: ConsoleReporter(verbose=True)),
+            ("--progress", ProgressReporter),
+            ("--quiet", QuietReporter),
+            ("--json", lambda: JsonReporter(emit=False)),
+        ]
+        timings = []
+        for name, make_reporter in modes:
+            start = time.perf_counter()
+            write_skill_archive(files, io.BytesIO(), reporter=make_reporter())
+            timings.append((name, time.perf_counter() - start))
+
+    print(f"\n{len(files)} files, stdout is {'a terminal' if sys.stdout.isatty() else 'not a terminal'}",
+          file=sys.stderr)
+    for name, elapsed in timings:
+        print(f"{name:<26} {elapsed:8.2f} s {len(files) / elapsed:10,.0f} files/s", file=sys.stderr)
+
+
+INDEX_SKILL_MD = """---
+name: many-files-skill
+description: Benchmark skill with a realistic frontmatter block used to compare discovery paths
+license: MIT
+metadata:
+  version: 1.0.0
+---
+
+# Skill
+"""
+
+
+def _frontmatter_from_zip(path):
+    """Discovery without an index: open the zip, read SKILL.md and parse its frontmatter"""
+    with zipfile.ZipFile(path) as zipf:
+        name = next(name for name in zipf.namelist() if name.endswith("/SKILL.md"))
+        with zipf.open(name) as f:
+            return read_frontmatter(f)
+
+
+def bench_index(args):
+    """Skill discovery over many archives: central directory + SKILL.md vs skill-index.jsonl"""
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = make_many_files_skill(tmp, args.files)
+        (skill / "SKILL.md").write_text(INDEX_SKILL_MD)
+        archive = Path(tmp) / "template.skill"
+        metadata = {"name": skill.name, "frontmatter": read_frontmatter(skill / "SKILL.md")}
+        with open(archive, "wb") as f:
+            write_skill_archive(collect_files(skill), f, index=metadata)
+        paths = []
+        for i in range(args.archives):
+            paths.append(Path(tmp) / f"skill-{i:04d}.skill")
+            shutil.copyfile(archive, paths[-1])
+
+        print(f"{args.archives} archives of {args.files + 1} files each")
+        modes = [
+            ("zipfile + SKILL.md", _frontmatter_from_zip),
+            ("index, first line", lambda path: read_index(path, files=False)["frontmatter"]),
+            ("index, all files", read_index),
+        ]
+        for name, load in modes:
+            start = time.perf_counter()
+            for path in paths:
+                load(path)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22} {elapsed * 1e3:8.1f} ms {elapsed / len(paths) * 1e6:8.0f} us/archive")
+
+
+def bench_install(args):
+    """Installing many archives: serial unzip vs one installer process each vs install_all"""
+    with tempfile.TemporaryDirectory() as tmp:
+        template = make_synthetic_skill(Path(tmp) / "template", args.size_mb, args.files)
+        archives = []
+        for i in range(args.archives):
+            name = f"skill-{i:04d}"
+            skill = Path(tmp) / "src" / name
+            shutil.copytree(template, skill)
+            (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: Benchmark skill\n---\n\n# Synthetic\n")
+            archives.append(package_skill(skill, Path(tmp) / "dist", reporter=QuietReporter()))
+            shutil.rmtree(skill)
+
+        installer = Path(__file__).with_name("install_skill.py")
+        modes = [
+            ("zipfile.extractall", lambda dest: [zipfile.ZipFile(archive).extractall(dest) for archive in archives]),
+            ("process per archive", lambda dest: [
+                subprocess.run([sys.executable, installer, archive, "--dest", dest, "--quiet"], check=True)
+                for archive in archives]),
+            (f"install_all jobs={args.jobs}", lambda dest: install_all(archives, dest, args.jobs)),
+        ]
+        print(f"{args.archives} archives of {args.files + 1} files, {args.size_mb} MB each")
+        for i, (name, install) in enumerate(modes):
+            dest = Path(tmp) / f"installed-{i}"
+            dest.mkdir()
+            start = time.perf_counter()
+            install(dest)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<22} {elapsed:8.2f} s {elapsed / len(archives) * 1e3:8.1f} ms/archive")
+
+
+def bench_validate(args):
+    """Validating every skill: one quick_validate.py process per skill vs validate_all, with and without the cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "skills"
+        for skill in discover_skills(args.root):
+            for i in range(args.copies):
+                shutil.copytree(skill, root / f"{skill.name}-{i}", ignore=shutil.ignore_patterns("__pycache__"))
+        skills = discover_skills(root)
+        cache_path = Path(tmp) / "validate-cache.json"
+        env = dict(os.environ, SKILL_VALIDATE_CACHE=str(cache_path))
+
+        validator = Path(__file__).with_name("quick_validate.py")
+        modes = [
+            ("process per skill", lambda: [
+                subprocess.run([sys.executable, validator, skill, "--no-cache"], stdout=subprocess.DEVNULL)
+                for skill in skills]),
+            ("validate_all jobs=1", lambda: validate_all(root, jobs=1)),
+            ("validate_all", lambda: validate_all(root)),
+            ("validate_all cold cache", lambda: validate_all(root, cache=ValidationCache(cache_path))),
+            ("validate_all warm cache", lambda: validate_all(root, cache=ValidationCache(cache_path))),
+            ("--all process, warm", lambda: subprocess.run(
+                [sys.executable, validator, "--all", root], stdout=subprocess.DEVNULL, env=env)),
+        ]
+        print(f"{len(skills)} skills, {os.cpu_count()} CPUs")
+        for name, validate in modes:
+            start = time.perf_counter()
+            validate()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {elapsed * 1e3:8.1f} ms {elapsed / len(skills) * 1e3:8.2f} ms/skill")
+
+
+def _frontmatter_text_regex(skill_md):
+    """The previous approach: read the whole file and match the frontmatter with a DOTALL regex"""
+    return re.match(r"^---\n(.*?)\n---", Path(skill_md).read_text(), re.DOTALL).group(1)
+
+
+def bench_frontmatter(args):
+    """Reading the frontmatter of a SKILL.md with a large body: whole file + regex vs streaming"""
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = Path(tmp) / "big-skill"
+        skill.mkdir()
+        line = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n"
+        for size_mb in args.body_mb:
+            with open(skill / "SKILL.md", "w") as f:
+                f.write(INDEX_SKILL_MD)
+                f.write(line * (size_mb * 2 ** 20 // len(line)))
+            modes = [
+                ("read_text + regex", lambda: _frontmatter_text_regex(skill / "SKILL.md")),
+                ("read_frontmatter_text", lambda: read_frontmatter_text(skill / "SKILL.md")),
+                ("validate_skill", lambda: validate_skill(skill)),
+            ]
+            print(f"SKILL.md with a {size_mb} MB body")
+            for name, read in modes:
+                rounds = 5
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    read()
+                elapsed = (time.perf_counter() - start) / rounds
+                print(f"  {name:<22} {elapsed * 1e3:10.3f} ms")
+
+
+def bench_parse(args):
+    """Frontmatter parse time (fast path vs PyYAML loaders) and validator startup time"""
+    import yaml
+
+    texts = [read_frontmatter_text(skill / "SKILL.md") for skill in discover_skills(args.root)]
+    modes = [("parse_frontmatter", parse_frontmatter),
+             ("yaml SafeLoader", lambda text: yaml.load(text, Loader=yaml.SafeLoader))]
+    if hasattr(yaml, "CSafeLoader"):
+        modes.insert(1, ("yaml CSafeLoader", lambda text: yaml.load(text, Loader=yaml.CSafeLoader)))
+    print(f"Parsing {len(texts)} frontmatter blocks, {args.rounds} rounds")
+    for name, parse in modes:
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for text in texts:
+                parse(text)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<22} {elapsed / (args.rounds * len(texts)) * 1e6:8.1f} us/skill")
+
+    skill = discover_skills(args.root)[0]
+    validator = Path(__file__).with_name("quick_validate.py")
+    commands = [
+        ("python -c pass", [sys.executable, "-c", "pass"]),
+        ("python -c 'import yaml'", [sys.executable, "-c", "import yaml"]),
+        ("quick_validate.py", [sys.executable, validator, skill]),
+    ]
+    print(f"Interpreter startup, best of {args.startup_runs} ({skill.name})")
+    for name, command in commands:
+        best = float("inf")
+        for _ in range(args.startup_runs):
+            start = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {name:<26} {best * 1e3:8.1f} ms")
+
+
+def _check_resources_naive(skill):
+    """A straightforward version: os.walk plus a stat per file, and a filesystem lookup per reference"""
+    total = 0
+    for dirpath, _, filenames in os.walk(skill):
+        for name in filenames:
+            total += os.stat(os.path.join(dirpath, name)).st_size
+    text = (skill / "SKILL.md").read_text()
+    return [target for _, _, target in skill_md_references(text) if not (skill / target).exists()], total
+
+
+def bench_deep(args):
+    """quick_validate.py --deep checks (single scandir index) as the number of files grows"""
+    for files in args.files:
+        with tempfile.TemporaryDirectory() as tmp:
+            skill = make_many_files_skill(tmp, files)
+            links = [f"- [doc {i}](references/part-{i % 100:03d}/doc-{i:06d}.md)" for i in range(0, files, 10)]
+            (skill / "SKILL.md").write_text("---\nname: many-files-skill\ndescription: Benchmark skill\n---\n\n"
+                                            + "\n".join(links) + "\n")
+            modes = [("check_resources", lambda: check_resources(skill, max_skill_md_lines=None)),
+                     ("walk + exists", lambda: _check_resources_naive(skill))]
+            print(f"{files:,} files, {len(links):,} links")
+            for name, check in modes:
+                best = float("inf")
+                for _ in range(3):
+                    start = time.perf_counter()
+                    check()
+                    best = min(best, time.perf_counter() - start)
+                print(f"  {name:<18} {best * 1e3:9.1f} ms {best / files * 1e6:7.2f} us/file")
+
+
+def bench_large(args):
+    """
+    Package a skill holding one sparse file over 4 GB and check the result.
+
+    The packager runs in its own process so its peak RSS is not inflated by
+    this script. The archive must open as ZIP64, pass zipfile's testzip()
+    (every member decompressed and CRC-checked) and hold the file at full size.
+    """
+    size = int(args.size_gb * (1 << 30))
+    # A stored extension makes the archive itself larger than 4 GB (ZIP64 offsets and end records)
+    name = "sparse.parquet" if args.stored else "sparse.bin"
+    with tempfile.TemporaryDirectory() as tmp:
+        skill = Path(tmp) / "large-skill"
+        (skill / "assets").mkdir(parents=True)
+        (skill / "SKILL.md").write_text("---\nname: large-skill\ndescription: Benchmark skill\n---\n\n# Large\n")
+        with open(skill / "assets" / name, "wb") as f:
+            f.truncate(size)
+
+        packager = Path(__file__).with_name("package_skill.py")
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, packager, skill, tmp, "--json", "--no-cache"],
+                                 capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if process.returncode:
+            print(process.stdout, process.stderr)
+            return 1
+        result = json.loads(process.stdout)
+
+        start = time.perf_counter()
+        with zipfile.ZipFile(result["archive"]) as zipf:
+            bad = zipf.testzip()
+            info = zipf.getinfo(f"large-skill/assets/{name}")
+        verify = time.perf_counter() - start
+
+        peak_mb = result["peak_rss"] / 2 ** 20 if result.get("peak_rss") else None
+        print(f"file {size / 2 ** 30:.2f} GB ({'stored' if args.stored else 'deflated'}), "
+              f"archive {result['archive_size'] / 2 ** 20:,.1f} MB")
+        print(f"package  {elapsed:8.2f} s   peak RSS {peak_mb:,.1f} MB" if peak_mb else f"package  {elapsed:8.2f} s")
+        print(f"testzip  {verify:8.2f} s   {'ok' if bad is None else f'bad member {bad}'}")
+        ok = bad is None and info.file_size == size
+        if peak_mb is not None and peak_mb > args.max_rss_mb:
+            print(f"peak RSS above the {args.max_rss_mb} MB bound")
+            ok = False
+        return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Skill tooling benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compress = subparsers.add_parser("compress", help="Packaging throughput by worker count")
+    compress.add_argument("--size-mb", type=int, default=1024, help="Synthetic skill size in MB")
+    compress.add_argument("--files", type=int, default=64, help="Number of data files")
+    compress.add_argument("--workers", type=lambda value: [int(n) for n in value.split(",")],
+                          default=[1, 2, 4, 8], help="Comma-separated worker counts")
+    compress.set_defaults(func=bench_compress)
+
+    incremental = subparsers.add_parser("incremental", help="Full vs incremental rebuild time")
+    incremental.add_argument("--size-mb", type=int, default=256, help="Synthetic skill size in MB")
+    incremental.add_argument("--files", type=int, default=64, help="Number of data files")
+    incremental.set_defaults(func=bench_incremental)
+
+    mixed = subparsers.add_parser("mixed", help="Compression policies over a mixed-asset skill")
+    mixed.add_argument("--size-mb", type=int, default=200, help="Approximate synthetic skill size in MB")
+    mixed.set_defaults(func=bench_mixed)
+
+    output = subparsers.add_parser("output", help="Packaging time by console output mode")
+    output.add_argument("--files", type=int, default=50_000, help="Number of files in the synthetic skill")
+    output.set_defaults(func=bench_output)
+
+    index = subparsers.add_parser("index", help="Skill discovery with and without skill-index.jsonl")
+    index.add_argument("--archives", type=int, default=300, help="Number of archives to scan")
+    index.add_argument("--files", type=int, default=500, help="Files per skill")
+    index.set_defaults(func=bench_index)
+
+    install = subparsers.add_parser("install", help="Installing many archives into a skills directory")
+    install.add_argument("--archives", type=int, default=32, help="Number of archives to install")
+    install.add_argument("--size-mb", type=int, default=8, help="Synthetic skill size in MB")
+    install.add_argument("--files", type=int, default=32, help="Data files per skill")
+    install.add_argument("--jobs", type=int, help="install_all worker processes (defaults to the CPU count)")
+    install.set_defaults(func=bench_install)
+
+    validate = subparsers.add_parser("validate", help="Validating every skill under a folder")
+    validate.add_argument("--root", default=Path(__file__).resolve().parents[2],
+                          help="Folder of skills to validate (defaults to this repository's skills)")
+    validate.add_argument("--copies", type=int, default=1, help="Validate this many copies of each skill")
+    validate.set_defaults(func=bench_validate)
+
+    frontmatter = subparsers.add_parser("frontmatter", help="Frontmatter reads from SKILL.md files with large bodies")
+    frontmatter.add_argument("--body-mb", type=lambda value: [int(n) for n in value.split(",")],
+                             default=[1, 8, 64], help="Comma-separated body sizes in MB")
+    frontmatter.set_defaults(func=bench_frontmatter)
+
+    parse = subparsers.add_parser("parse", help="Frontmatter parse time and validator startup time")
+    parse.add_argument("--root", default=Path(__file__).resolve().parents[2],
+                       help="Folder of skills whose frontmatter is parsed (defaults to this repository's skills)")
+    parse.add_argument("--rounds", type=int, default=200, help="Parses of each frontmatter block")
+    parse.add_argument("--startup-runs", type=int, default=10, help="Runs of each startup command")
+    parse.set_defaults(func=bench_parse)
+
+    deep = subparsers.add_parser("deep", help="Deep validation time by number of files")
+    deep.add_argument("--files", type=lambda value: [int(n) for n in value.split(",")],
+                      default=[1000, 10_000, 50_000], help="Comma-separated file counts")
+    deep.set_defaults(func=bench_deep)
+
+    large = subparsers.add_parser("large", help="Packaging a sparse file over 4 GB in bounded memory (slow)")
+    large.add_argument("--size-gb", type=float, default=4.5, help="Size of the sparse file in GB")
+    large.add_argument("--stored", action="store_true",
+                       help="Store the file uncompressed, so the archive itself exceeds 4 GB")
+    large.add_argument("--max-rss-mb", type=int, default=256, help="Fail if the packager's peak RSS exceeds this")
+    large.set_defaults(func=bench_large)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
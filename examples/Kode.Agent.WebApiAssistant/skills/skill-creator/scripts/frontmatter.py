@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Frontmatter Reader - Reads the YAML frontmatter of a SKILL.md without reading its body
+
+Used by quick_validate.py, package_skill.py and the skill-index.jsonl builder.
+
+The file is read line by line until the closing "---", so the cost does not
+depend on the size of the Markdown body. A frontmatter block larger than
+max_bytes (MAX_FRONTMATTER_BYTES by default) is rejected instead of reading on
+through a file that never closes it.
+
+Parsing tries a restricted parser first. It covers what SKILL.md frontmatter
+normally holds: "key: value" lines with plain or quoted single-line scalars,
+">-"/"|" block scalars, and nested mappings and "- item" lists such as
+metadata. Anything outside that subset, or any scalar YAML would read as a
+number, boolean, null or date, is handed to PyYAML, which is imported only
+then and uses the libyaml CSafeLoader when available. Input the fast path
+accepts parses to exactly what yaml.safe_load returns.
+"""
+
+import re
+
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
+
+class FrontmatterError(ValueError):
+    """A SKILL.md whose frontmatter is missing, unterminated, too large or not a YAML dictionary"""
+
+
+class _Unsupported(Exception):
+    """Input outside the fast path's subset of YAML"""
+
+
+_KEY = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?: +(.*))?$')
+# Plain scalars that YAML resolves to something other than a string (bool, null,
+# int, float, timestamp, merge and value keys), or that start with an indicator
+_NOT_A_STRING = re.compile(
+    r'(?:yes|Yes|YES|no|No|NO|true|True|TRUE|false|False|FALSE|on|On|ON|off|Off|OFF'
+    r'|~|null|Null|NULL|<<|=|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)|\.[0-9_]+(?:[eE][-+][0-9]+)?'
+    r'|[-+]?(?:0b[0-1_]+|0x[0-9a-fA-F_]+|[0-9][0-9_]*(?::[0-5]?[0-9])*(?:\.[0-9_]*(?:[eE][-+][0-9]+)?)?)'
+    r'|[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}(?:[Tt ].*)?'
+    r'|[-?:,\[\]{}#&*!|>\'"%@`].*)$', re.DOTALL)
+# Characters the fast path leaves to PyYAML: tabs, carriage returns, non-ASCII
+# line breaks, the BOM and anything YAML does not allow in a stream
+_SPECIAL = re.compile('[\x00-\x09\x0B-\x1F\x7F-\x9F\u2028\u2029\uD800-\uDFFF\uFEFF\uFFFE\uFFFF]')
+_BLOCK_STYLES = {'>': (' ', '\n'), '>-': (' ', ''), '|': ('\n', '\n'), '|-': ('\n', '')}
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(' '))
+
+
+def _skip(lines, i):
+    """Index of the next line that is not blank or a comment"""
+    while i < len(lines) and (not lines[i].strip() or lines[i].lstrip(' ').startswith('#')):
+        i += 1
+    return i
+
+
+def _scalar(text):
+    """A single-line plain, single-quoted or double-quoted string scalar"""
+    text = text.rstrip(' ')
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        inner = text[1:-1]
+        if '"' in inner or '\\' in inner:
+            raise _Unsupported
+        return inner
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        inner = text[1:-1]
+        if "'" in inner.replace("''", ''):
+            raise _Unsupported
+        return inner.replace("''", "'")
+    if not text or _NOT_A_STRING.match(text) or ': ' in text or ' #' in text or text.endswith(':'):
+        raise _Unsupported
+    return text
+
+
+def _block_scalar(lines, i, parent_indent, style):
+    """A ">", ">-", "|" or "|-" block scalar of equally indented, non-blank lines"""
+    separator, ending = _BLOCK_STYLES[style]
+    if i >= len(lines) or not lines[i].strip():
+        raise _Unsupported
+    indent = _indent(lines[i])
+    if indent <= parent_indent:
+        raise _Unsupported
+    content = []
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip():
+            following = i
+            while following < len(lines) and not lines[following].strip():
+                if len(lines[following]) > indent:
+                    raise _Unsupported  # spaces past the indent are content
+                following += 1
+            if following < len(lines) and _indent(lines[following]) >= indent:
+                raise _Unsupported
+            break
+        line_indent = _indent(line)
+        if line_indent < indent:
+            if line_indent > parent_indent:
+                raise _Unsupported
+            break
+        if line_indent > indent or line.endswith(' '):
+            raise _Unsupported
+        content.append(line[indent:])
+        i += 1
+    if i == len(lines):
+        ending = ''  # the text ends without a line break after the last line
+    return separator.join(content) + ending, i
+
+
+def _sequence(lines, i, indent):
+    """A block sequence of "- scalar" items"""
+    items = []
+    while True:
+        i = _skip(lines, i)
+        if i >= len(lines) or _indent(lines[i]) < indent:
+            return items, i
+        line = lines[i]
+        if _indent(line) > indent or not line.startswith('- ', indent):
+            if _indent(line) == indent and not line.startswith('-', indent):
+                return items, i
+            raise _Unsupported
+        items.append(_scalar(line[indent + 2:].lstrip(' ')))
+        i += 1
+
+
+def _mapping(lines, i, indent):
+    """A block mapping of plain keys at the given indent"""
+    mapping = {}
+    while True:
+        i = _skip(lines, i)
+        if i >= len(lines) or _indent(lines[i]) < indent:
+            return mapping, i
+        if _indent(lines[i]) > indent:
+            raise _Unsupported
+        match = _KEY.match(lines[i], indent)
+        if not match or _NOT_A_STRING.match(match.group(1)):
+            raise _Unsupported
+        key, value = match.group(1), (match.group(2) or '').rstrip(' ')
+        if value in _BLOCK_STYLES:
+            mapping[key], i = _block_scalar(lines, i + 1, indent, value)
+        elif value:
+            mapping[key] = _scalar(value)
+            i += 1
+        else:
+            i = _skip(lines, i + 1)
+            if i >= len(lines):
+                raise _Unsupported
+            child_indent = _indent(lines[i])
+            if lines[i].startswith('- ', child_indent) and child_indent >= indent:
+                mapping[key], i = _sequence(lines, i, child_indent)
+            elif child_indent > indent:
+                mapping[key], i = _mapping(lines, i, child_indent)
+            else:
+                raise _Unsupported
+
+
+def _parse_fast(text):
+    """Parse frontmatter in the fast path's subset, or return None to fall back to PyYAML"""
+    if _SPECIAL.search(text):
+        return None
+    lines = text.split('\n')
+    try:
+        frontmatter, i = _mapping(lines, 0, 0)
+    except _Unsupported:
+        return None
+    if not frontmatter or _skip(lines, i) < len(lines):
+        return None
+    return frontmatter
+
+
+def _parse_yaml(text):
+    """Parse with PyYAML, imported on first use, preferring the libyaml loader"""
+    import yaml
+
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    try:
+        return yaml.load(text, Loader=loader)
+    except yaml.YAMLError as e:
+        raise FrontmatterError(f"Invalid YAML in frontmatter: {e}")
+
+
+def read_frontmatter_text(source, max_bytes=MAX_FRONTMATTER_BYTES):
+    """
+    Read the raw frontmatter block of a SKILL.md.
+
+    Args:
+        source: Path to a SKILL.md, or a binary file object positioned at its start
+        max_bytes: Maximum size of the frontmatter block, delimiter lines included
+
+    Returns:
+        The text between the opening and closing "---" lines
+
+    Raises:
+        FrontmatterError: If the file does not start with "---", the block is not
+            closed within max_bytes, or it is not valid UTF-8
+    """
+    if not hasattr(source, 'readline'):
+        with open(source, 'rb') as f:
+            return read_frontmatter_text(f, max_bytes)
+
+    first = source.readline(max_bytes + 1)
+    if not first.startswith(b'---'):
+        raise FrontmatterError("No YAML frontmatter found")
+    if first.rstrip(b'\r\n') != b'---':
+        raise FrontmatterError("Invalid frontmatter format")
+
+    lines = []
+    total = len(first)
+    while True:
+        line = source.readline(max_bytes - total + 1)
+        total += len(line)
+        if total > max_bytes:
+            raise FrontmatterError(f"Frontmatter is larger than {max_bytes:,} bytes")
+        if not line:
+            raise FrontmatterError("Invalid frontmatter format")
+        if line.startswith(b'---'):
+            break
+        lines.append(line)
+
+    try:
+        return b''.join(lines).decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise FrontmatterError(f"Frontmatter is not valid UTF-8: {e}")
+
+
+def read_frontmatter(source, max_bytes=MAX_FRONTMATTER_BYTES):
+    """
+    Read and parse the frontmatter of a SKILL.md.
+
+    Args:
+        source: Path to a SKILL.md, or a binary file object positioned at its start
+        max_bytes: Maximum size of the frontmatter block
+
+    Returns:
+        The frontmatter as a dict
+
+    Raises:
+        FrontmatterError: As read_frontmatter_text, or if the block is not a YAML dictionary
+    """
+    return parse_frontmatter(read_frontmatter_text(source, max_bytes))
+
+
+def parse_frontmatter(text):
+    """
+    Parse frontmatter text, with the fast path first and PyYAML as the fallback.
+
+    Returns:
+        The frontmatter as a dict
+
+    Raises:
+        FrontmatterError: If the text is not valid YAML or not a dictionary
+    """
+    frontmatter = _parse_fast(text)
+    if frontmatter is None:
+        frontmatter = _parse_yaml(text)
+    if not isinstance(frontmatter, dict):
+        raise FrontmatterError("Frontmatter must be a YAML dictionary")
+    return frontmatter
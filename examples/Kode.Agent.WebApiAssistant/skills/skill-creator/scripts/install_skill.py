@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Skill Installer - Installs .skill files into a skills directory
+
+Usage:
+    python utils/install_skill.py <skill-file> [<skill-file> ...] [--dest skills-directory] [--force]
+                                  [--workers N] [--jobs N] [--require-hashes] [--max-total-size SIZE]
+                                  [--summary-json FILE] [--quiet | --json]
+
+Example:
+    python utils/install_skill.py dist/my-skill.skill --dest skills/public
+    python utils/install_skill.py dist/*.skill --dest /opt/agent/skills --force --summary-json install.json
+
+Each archive is checked before anything is installed:
+    - every member lies inside a single top-level skill folder (no absolute
+      paths, "..", backslashes or symlinks)
+    - file contents match the SHA-256 hashes from the archive's skill-index.jsonl
+      and/or the <name>.skill.manifest.json next to it (and the zip CRCs)
+    - the extracted skill passes validate_skill
+
+Members are extracted in parallel into a temporary folder inside the skills
+directory, which is then renamed into place, so a skill is either fully
+installed or not installed at all.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+from quick_validate import validate_skill
+from skill_archive import INDEX_NAME, manifest_path_for, read_index
+from skill_reporter import ConsoleReporter, JsonReporter, QuietReporter
+from skill_resources import parse_size
+
+_COPY_BUFFER = 1 << 20
+
+
+class InstallError(Exception):
+    """An archive that cannot be installed"""
+
+
+def check_member_names(infos):
+    """
+    Check member names and return the skill folder name they all live in.
+
+    Raises:
+        InstallError: On empty or absolute paths, "..", backslashes, symlinks, duplicates
+            or members outside a single top-level folder
+    """
+    skill_names = set()
+    seen = set()
+    for info in infos:
+        name = info.filename
+        path = PurePosixPath(name)
+        if not path.parts or path.is_absolute():
+            # "", "." and "/" have no top-level folder to check
+            raise InstallError(f"Unsafe path in archive: {name!r}")
+        if (name.startswith('/') or '\\' in name or ':' in path.parts[0]
+                or any(part in ('', '.', '..') for part in name.rstrip('/').split('/'))):
+            raise InstallError(f"Unsafe path in archive: {name!r}")
+        if stat.S_ISLNK(info.external_attr >> 16):
+            raise InstallError(f"Symbolic links are not allowed: {name!r}")
+        if name in seen:
+            raise InstallError(f"Duplicate member: {name!r}")
+        seen.add(name)
+        if len(path.parts) < 2 and not info.is_dir():
+            raise InstallError(f"File outside the skill folder: {name!r}")
+        skill_names.add(path.parts[0])
+
+    if len(skill_names) != 1:
+        raise InstallError(f"Archive must contain exactly one skill folder, found: {', '.join(sorted(skill_names))}")
+    return skill_names.pop()
+
+
+def expected_hashes(archive_path, infos):
+    """
+    Collect the SHA-256 of every file from the archive's index and its manifest.
+
+    Returns:
+        Dict of member name to hex SHA-256 (empty if neither source exists)
+
+    Raises:
+        InstallError: If a source is malformed, lists different files than the archive,
+            or the sources disagree
+    """
+    names = {info.filename for info in infos if not info.is_dir()}
+    sources = []
+
+    try:
+        index = read_index(archive_path)
+        if index is not None:
+            sources.append((INDEX_NAME, {entry['path']: entry.get('sha256') for entry in index['files']}))
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        raise InstallError(f"Corrupt {INDEX_NAME}: {type(e).__name__}: {e}")
+
+    manifest_path = manifest_path_for(archive_path)
+    if manifest_path.is_file():
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            sources.append((manifest_path.name,
+                            {name: entry.get('sha256') for name, entry in manifest['files'].items()}))
+        except (KeyError, ValueError, TypeError, AttributeError) as e:
+            raise InstallError(f"Unreadable manifest {manifest_path.name}: {type(e).__name__}: {e}")
+
+    hashes = {}
+    for source, entries in sources:
+        if set(entries) != names:
+            difference = sorted(set(entries) ^ names)
+            raise InstallError(f"{source} does not match the archive contents: {', '.join(difference[:5])}")
+        for name, digest in entries.items():
+            if digest and hashes.setdefault(name, digest) != digest:
+                raise InstallError(f"Hash mismatch between sources for {name}")
+    return hashes
+
+
+def _extract_member(zipf, info, dest_root, expected):
+    """Extract one file, checking its SHA-256 (zipfile checks the CRC)"""
+    target = dest_root.joinpath(*PurePosixPath(info.filename).parts)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    with zipf.open(info) as src, open(target, 'wb') as dst:
+        while True:
+            block = src.read(_COPY_BUFFER)
+            if not block:
+                break
+            digest.update(block)
+            dst.write(block)
+    if expected and digest.hexdigest() != expected:
+        raise InstallError(f"SHA-256 mismatch for {info.filename}")
+    mode = (info.external_attr >> 16) & 0o777
+    if mode:
+        os.chmod(target, mode & 0o755 | 0o600)
+
+
+def install_skill(archive_path, skills_dir=None, force=False, workers=None, require_hashes=False,
+                  max_total_size=None, reporter=None):
+    """
+    Verify, extract and install a .skill file into a skills directory.
+
+    Args:
+        archive_path: Path to the .skill file
+        skills_dir: Directory the skill folder is installed into (defaults to current directory)
+        force: Replace an existing installation of the same skill
+        workers: Number of extraction threads (defaults to the CPU count)
+        require_hashes: Fail if neither an index nor a manifest provides file hashes
+        max_total_size: Fail if the uncompressed contents exceed this many bytes
+        reporter: Reporter receiving messages and the result (defaults to ConsoleReporter)
+
+    Returns:
+        Path to the installed skill folder, or None if error
+    """
+    reporter = reporter or ConsoleReporter()
+    archive_path = Path(archive_path).resolve()
+    skills_dir = Path(skills_dir or Path.cwd()).resolve()
+    result = {"archive": str(archive_path)}
+    start = time.perf_counter()
+    try:
+        installed, files, size = _install_skill(archive_path, skills_dir, force, workers, require_hashes,
+                                                max_total_size, reporter)
+    except (InstallError, zipfile.BadZipFile, OSError) as e:
+        reporter.error(f"❌ {archive_path.name}: {e}")
+        result.update(status="failed", error=str(e), seconds=round(time.perf_counter() - start, 3))
+        reporter.finish(result)
+        return None
+
+    result.update(status="ok", skill=installed.name, path=str(installed), files=files, size=size,
+                  seconds=round(time.perf_counter() - start, 3))
+    reporter.info(f"✅ Installed {installed.name} to {installed}")
+    reporter.finish(result)
+    return installed
+
+
+def _install_skill(archive_path, skills_dir, force, workers, require_hashes, max_total_size, reporter):
+    with zipfile.ZipFile(archive_path) as zipf:
+        infos = [info for info in zipf.infolist() if info.filename != INDEX_NAME]
+        skill_name = check_member_names(infos)
+        files = [info for info in infos if not info.is_dir()]
+        size = sum(info.file_size for info in files)
+        if max_total_size is not None and size > max_total_size:
+            raise InstallError(f"Uncompressed size {size:,} bytes exceeds the {max_total_size:,} byte limit")
+
+        hashes = expected_hashes(archive_path, infos)
+        if not hashes:
+            if require_hashes:
+                raise InstallError("No skill-index.jsonl or manifest to verify file hashes against")
+            reporter.info(f"⚠️  {archive_path.name}: no file hashes available, checking CRCs only")
+
+        target = skills_dir / skill_name
+        if target.exists() and not force:
+            raise InstallError(f"{target} already exists (use --force to replace it)")
+
+        skills_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".install-{skill_name}-", dir=skills_dir))
+        try:
+            # zipfile serialises reads of the shared file; decompression and writes run in parallel
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+                futures = [executor.submit(_extract_member, zipf, info, staging, hashes.get(info.filename))
+                           for info in files]
+                for future in futures:
+                    future.result()
+
+            valid, message = validate_skill(staging / skill_name)
+            if not valid:
+                raise InstallError(f"Validation failed: {message}")
+
+            _replace(staging / skill_name, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return target, len(files), size
+
+
+def _replace(source, target):
+    """Rename source to target, moving an existing target aside first"""
+    if not target.exists():
+        os.rename(source, target)
+        return
+    backup = Path(tempfile.mkdtemp(prefix=f".replaced-{target.name}-", dir=target.parent))
+    os.rename(target, backup / target.name)
+    try:
+        os.rename(source, target)
+    except OSError:
+        os.rename(backup / target.name, target)
+        raise
+    finally:
+        shutil.rmtree(backup, ignore_errors=True)
+
+
+def _install_one(archive_path, skills_dir, options):
+    """Install one archive in a worker process, collecting its output in a JsonReporter"""
+    reporter = JsonReporter(emit=False)
+    try:
+        install_skill(archive_path, skills_dir, reporter=reporter, **options)
+    except Exception as e:
+        return {"archive": str(archive_path), "status": "failed", "error": str(e)}
+    result = reporter.result
+    result["warnings"] = [message for message in result.pop("messages") if message.startswith("⚠️")]
+    del result["errors"]
+    return result
+
+
+def install_all(archives, skills_dir=None, jobs=None, **options):
+    """
+    Install many .skill files concurrently, one worker process per archive.
+
+    A failure in one archive is recorded in its result and does not stop the others.
+
+    Args:
+        archives: Paths to .skill files
+        skills_dir: Directory the skills are installed into (defaults to current directory)
+        jobs: Number of worker processes (defaults to the CPU count)
+        **options: Passed to install_skill (force, workers, require_hashes, max_total_size)
+
+    Returns:
+        List of per-archive result dicts, in input order
+    """
+    if options.get("workers") is None:
+        options["workers"] = 2  # most parallelism comes from the process pool
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_install_one, Path(archive), skills_dir, options) for archive in archives]
+        results = []
+        for archive, future in zip(archives, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"archive": str(archive), "status": "failed", "error": str(e)})
+    return results
+
+
+def print_summary(results, elapsed):
+    """Print one row per archive (status, skill, files, size, time) and totals"""
+    print(f"{'archive':<32} {'status':>7} {'skill':<24} {'files':>7} {'size':>14} {'s':>7}")
+    for result in results:
+        name = Path(result["archive"]).name[:32]
+        if result["status"] == "ok":
+            print(f"{name:<32} {'ok':>7} {result['skill'][:24]:<24} {result['files']:>7,} {result['size']:>14,} "
+                  f"{result['seconds']:>7.2f}")
+        else:
+            print(f"{name:<32} {'failed':>7} {'':<24} {'':>7} {'':>14} {result.get('seconds', 0):>7.2f}")
+            print(f"   {result['error']}")
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(f"\n{len(results) - failed} installed, {failed} failed in {elapsed:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Install .skill files into a skills directory",
+        epilog="Example:\n"
+               "  python utils/install_skill.py dist/my-skill.skill --dest skills/public\n"
+               "  python utils/install_skill.py dist/*.skill --dest /opt/agent/skills --force",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("archives", nargs="+", help=".skill files to install")
+    parser.add_argument("--dest", help="Skills directory to install into (defaults to current directory)")
+    parser.add_argument("--force", action="store_true", help="Replace skills that are already installed")
+    parser.add_argument("--workers", type=int, help="Extraction threads per archive (defaults to the CPU count)")
+    parser.add_argument("--jobs", type=int, help="Archives installed concurrently (defaults to the CPU count)")
+    parser.add_argument("--require-hashes", action="store_true",
+                        help="Fail if an archive has neither a skill-index.jsonl nor a manifest to verify")
+    parser.add_argument("--max-total-size", type=parse_size, metavar="SIZE",
+                        help="Fail if an archive's uncompressed contents exceed SIZE (e.g. 2G)")
+    parser.add_argument("--summary-json", metavar="FILE", help="With several archives, write per-archive results")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--quiet", action="store_true", help="Print errors only")
+    output.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    options = dict(force=args.force, workers=args.workers, require_hashes=args.require_hashes,
+                   max_total_size=args.max_total_size)
+
+    if len(args.archives) == 1:
+        if args.quiet:
+            reporter = QuietReporter()
+        elif args.json:
+            reporter = JsonReporter()
+        else:
+            reporter = ConsoleReporter()
+        reporter.info(f"📦 Installing skill: {args.archives[0]}")
+        sys.exit(0 if install_skill(args.archives[0], args.dest, reporter=reporter, **options) else 1)
+
+    start = time.perf_counter()
+    results = install_all(args.archives, args.dest, args.jobs, **options)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    elif args.quiet:
+        for result in results:
+            if result["status"] != "ok":
+                print(f"❌ {Path(result['archive']).name}: {result['error']}")
+    else:
+        print_summary(results, time.perf_counter() - start)
+    if args.summary_json:
+        Path(args.summary_json).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+    sys.exit(0 if all(result["status"] == "ok" for result in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,55 +3,265 @@
 Skill Packager - Creates a distributable .skill file of a skill folder
 
 Usage:
-    python utils/package_skill.py <path/to/skill-folder> [output-directory]
+    python utils/package_skill.py <path/to/skill-folder> [output-directory] [--workers N] [--incremental]
+                                   [--level N] [--text-level N] [--lzma] [--report] [--deterministic]
+                                   [--dry-run] [--no-index] [--no-cache] [--max-file-size SIZE]
+                                   [--max-total-size SIZE]
+                                   [--verbose | --quiet | --progress | --json]
+    python utils/package_skill.py --all <skills-root> [output-directory] [--jobs N] [--summary-json FILE]
+
+    Pass "-" as the output directory to stream the archive to stdout. With the
+    index (the default) output starts once every file is compressed; add
+    --no-index to emit each file as soon as it is compressed.
 
 Example:
     python utils/package_skill.py skills/public/my-skill
     python utils/package_skill.py skills/public/my-skill ./dist
+    python utils/package_skill.py skills/public/my-skill ./dist --workers 8
+    python utils/package_skill.py skills/public/my-skill ./dist --incremental
+    python utils/package_skill.py skills/public/my-skill ./dist --text-level 9 --report
+    python utils/package_skill.py skills/public/my-skill - --deterministic | upload-artifact
+    python utils/package_skill.py skills/public/my-skill --dry-run
+    python utils/package_skill.py --all skills/public ./dist --summary-json dist/summary.json
 """
 
+import argparse
+import json
+import os
 import sys
-import zipfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext, redirect_stdout
 from pathlib import Path
-from quick_validate import validate_skill
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from frontmatter import read_frontmatter
+from quick_validate import ValidationCache, validate_skill
+from skill_archive import (
+    DEFAULT_POLICY, METHOD_NAMES, ZIP_DEFLATED, ZIP_LZMA, CompressionPolicy, PreviousBuild, SkillArchiveWriter,
+    compress_files, manifest_path_for, normalize_arcname, write_manifest,
+)
+from skill_ignore import discover_skills, walk_skill
+from skill_resources import parse_size
+from skill_reporter import ConsoleReporter, JsonReporter, ProgressReporter, QuietReporter, Reporter
+
+
+def collect_files(skill_path, excluded=None):
+    """
+    List the files of a skill folder, skipping those matched by .skillignore or the built-in defaults.
+
+    Args:
+        skill_path: Path to the skill folder
+        excluded: Optional list that receives each ignored path
+
+    Returns:
+        Sorted list of (file_path, arcname), with arcnames relative to the skill's parent
+    """
+    skill_path = Path(skill_path)
+    return sorted(
+        ((file_path, normalize_arcname(f"{skill_path.name}/{relpath}"))
+         for file_path, relpath in walk_skill(skill_path, excluded=excluded)),
+        key=lambda item: item[1],
+    )
+
+
+def check_size_limits(files, max_file_size=None, max_total_size=None):
+    """
+    Check file sizes against the limits before anything is read.
+
+    Returns:
+        An error message, or None if the files are within the limits
+    """
+    total = 0
+    for file_path, arcname in files:
+        size = os.stat(file_path).st_size
+        if max_file_size is not None and size > max_file_size:
+            return f"{arcname} is {size:,} bytes, over the {max_file_size:,} byte file size limit"
+        total += size
+    if max_total_size is not None and total > max_total_size:
+        return f"Skill is {total:,} bytes, over the {max_total_size:,} byte total size limit"
+    return None
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None if unavailable"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
 
 
-def package_skill(skill_path, output_dir=None):
+def write_skill_archive(files, fileobj, workers=None, policy=DEFAULT_POLICY, reuse=None, deterministic=False,
+                        reporter=None, index=None):
+    """
+    Compress files and write them as a .skill archive to a binary file object.
+
+    The file object is only ever appended to, so it may be a pipe or stdout.
+    With an index nothing is written until the last file is compressed, since
+    the index that comes first records every member's offset.
+
+    Args:
+        files: Sorted list of (file_path, arcname), as returned by collect_files
+        fileobj: Writable binary file object
+        workers: Number of compression threads (defaults to the CPU count)
+        policy: CompressionPolicy choosing how each file is compressed
+        reuse: Optional callable returning an already compressed member (PreviousBuild.reuse)
+        deterministic: Fixed timestamps and permissions for byte-identical output
+        reporter: Reporter notified of each member written
+        index: Skill metadata for a leading skill-index.jsonl member, or None for no index
+
+    Returns:
+        List of the ArchiveMembers written
+    """
+    reporter = reporter or Reporter()
+    reporter.start(files)
+    writer = SkillArchiveWriter(fileobj, deterministic, index)
+    file_done = reporter.file_done
+    for member in compress_files(files, workers, policy, reuse):
+        writer.write(member)
+        file_done(member)
+    writer.close()
+    reporter.end(writer.members)
+    return writer.members
+
+
+def package_skill(skill_path, output_dir=None, workers=None, incremental=False, policy=DEFAULT_POLICY,
+                  report=False, deterministic=False, fileobj=None, reporter=None, index=True, max_file_size=None,
+                  max_total_size=None, cache=False):
     """
     Package a skill folder into a .skill file.
 
+    Files are compressed in parallel and written in sorted order. A manifest of
+    each file's size, mtime and SHA-256 is written next to the .skill file; with
+    incremental=True, files unchanged since the previous build are copied from
+    the previous archive without being recompressed. Already-compressed assets
+    are stored rather than deflated (see CompressionPolicy). With
+    deterministic=True the same skill contents always produce the same bytes.
+    The archive starts with a skill-index.jsonl member (frontmatter plus each
+    file's size, hashes and offsets) unless index=False. Large files are read
+    and compressed in chunks, and archives over 2 GB use ZIP64.
+
     Args:
         skill_path: Path to the skill folder
         output_dir: Optional output directory for the .skill file (defaults to current directory)
+        workers: Number of compression threads (defaults to the CPU count)
+        incremental: Reuse unchanged members of the previous .skill file
+        policy: CompressionPolicy choosing how each file is compressed
+        report: Report bytes saved and time spent per file
+        deterministic: Fixed timestamps (SOURCE_DATE_EPOCH or 1980-01-01) and permissions
+        fileobj: Stream the archive to this binary file object instead of writing
+            <output_dir>/<name>.skill (no manifest is written)
+        reporter: Reporter receiving messages and the result (defaults to ConsoleReporter)
+        index: Write a leading skill-index.jsonl member
+        max_file_size: Fail if any file is larger than this many bytes
+        max_total_size: Fail if the files add up to more than this many bytes
+        cache: Reuse and record the validation result in the ValidationCache
 
     Returns:
-        Path to the created .skill file, or None if error
+        Path to the created .skill file (or fileobj when streaming), or None if error
     """
+    reporter = reporter or ConsoleReporter()
     skill_path = Path(skill_path).resolve()
+    result = {"skill": skill_path.name, "path": str(skill_path)}
+    start = time.perf_counter()
 
+    packaged = _package_skill(skill_path, output_dir, workers, incremental, policy, report, deterministic, fileobj,
+                              reporter, index, max_file_size, max_total_size, cache)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+
+    if packaged is None:
+        result.update(status="failed", error=" ".join(reporter.errors) or "packaging failed")
+        reporter.finish(result)
+        return None
+
+    archive, members = packaged
+    size = sum(member.size for member in members)
+    archive_size = archive.stat().st_size if fileobj is None else None
+    result.update(
+        status="ok",
+        archive=str(archive) if fileobj is None else None,
+        files=len(members),
+        size=size,
+        compressed_size=sum(member.compressed_size for member in members),
+        archive_size=archive_size,
+        ratio=round(archive_size / size, 4) if archive_size and size else None,
+        reused=sum(1 for member in members if member.reused),
+        peak_rss=peak_rss(),
+    )
+    if report:
+        result["members"] = [
+            {
+                "arcname": member.arcname,
+                "method": "reused" if member.reused else METHOD_NAMES[member.compress_type],
+                "size": member.size,
+                "compressed_size": member.compressed_size,
+                "ms": round(member.elapsed * 1e3, 3),
+            }
+            for member in members
+        ]
+    reporter.finish(result)
+    return archive
+
+
+def _package_skill(skill_path, output_dir, workers, incremental, policy, report, deterministic, fileobj, reporter,
+                   index, max_file_size, max_total_size, cache):
+    """Validate and package; returns (archive path or fileobj, members), or None after reporting an error"""
     # Validate skill folder exists
     if not skill_path.exists():
-        print(f"❌ Error: Skill folder not found: {skill_path}")
+        reporter.error(f"❌ Error: Skill folder not found: {skill_path}")
         return None
 
     if not skill_path.is_dir():
-        print(f"❌ Error: Path is not a directory: {skill_path}")
+        reporter.error(f"❌ Error: Path is not a directory: {skill_path}")
         return None
 
     # Validate SKILL.md exists
     skill_md = skill_path / "SKILL.md"
     if not skill_md.exists():
-        print(f"❌ Error: SKILL.md not found in {skill_path}")
+        reporter.error(f"❌ Error: SKILL.md not found in {skill_path}")
         return None
 
     # Run validation before packaging
-    print("🔍 Validating skill...")
-    valid, message = validate_skill(skill_path)
+    reporter.info("🔍 Validating skill...")
+    if cache:
+        validation_cache = ValidationCache()
+        valid, message = validation_cache.validate(skill_path)
+        validation_cache.save()
+    else:
+        valid, message = validate_skill(skill_path)
     if not valid:
-        print(f"❌ Validation failed: {message}")
-        print("   Please fix the validation errors before packaging.")
+        reporter.error(f"❌ Validation failed: {message}")
+        reporter.info("   Please fix the validation errors before packaging.")
+        return None
+    reporter.info(f"✅ {message}\n")
+
+    metadata = {"name": skill_path.name, "frontmatter": read_frontmatter(skill_md)} if index else None
+
+    files = collect_files(skill_path)
+    limit_error = check_size_limits(files, max_file_size, max_total_size)
+    if limit_error:
+        reporter.error(f"❌ Error: {limit_error}")
         return None
-    print(f"✅ {message}\n")
+
+    if fileobj is not None:
+        if incremental:
+            reporter.error("❌ Error: --incremental needs a previous .skill file and cannot be used when streaming")
+            return None
+        try:
+            members = write_skill_archive(files, fileobj, workers, policy,
+                                          deterministic=deterministic, reporter=reporter, index=metadata)
+            fileobj.flush()
+        except Exception as e:
+            reporter.error(f"❌ Error streaming .skill file: {e}")
+            return None
+        if report:
+            reporter.info(format_compression_report(members))
+        reporter.info(f"\n✅ Successfully streamed skill: {skill_path.name}")
+        return fileobj, members
 
     # Determine output location
     skill_name = skill_path.name
@@ -62,43 +272,250 @@ def package_skill(skill_path, output_dir=None):
         output_path = Path.cwd()
 
     skill_filename = output_path / f"{skill_name}.skill"
+    manifest_filename = manifest_path_for(skill_filename)
+    tmp_filename = skill_filename.with_name(skill_filename.name + ".tmp")
 
     # Create the .skill file (zip format)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Walk through the skill directory
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    # Calculate the relative path within the zip
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
-
-        print(f"\n✅ Successfully packaged skill to: {skill_filename}")
-        return skill_filename
+        # Write to a temporary file so the previous archive stays readable while reusing it
+        previous = PreviousBuild(skill_filename, manifest_filename, policy) if incremental else nullcontext()
+        with previous, open(tmp_filename, 'wb') as f:
+            members = write_skill_archive(files, f, workers, policy, previous.reuse if incremental else None,
+                                          deterministic, reporter, metadata)
+
+        os.replace(tmp_filename, skill_filename)
+        write_manifest(manifest_filename, members, policy)
+
+        if report:
+            reporter.info(format_compression_report(members))
+        reporter.info(f"\n✅ Successfully packaged skill to: {skill_filename}")
+        return skill_filename, members
 
     except Exception as e:
-        print(f"❌ Error creating .skill file: {e}")
+        reporter.error(f"❌ Error creating .skill file: {e}")
+        if tmp_filename.exists():
+            tmp_filename.unlink()
         return None
 
 
+def dry_run(skill_path):
+    """
+    Print the files that would be packaged, with their sizes, and what is excluded.
+
+    Returns:
+        True if the skill folder exists, False otherwise
+    """
+    skill_path = Path(skill_path).resolve()
+    if not skill_path.is_dir():
+        print(f"❌ Error: Skill folder not found: {skill_path}")
+        return False
+
+    excluded = []
+    files = collect_files(skill_path, excluded)
+    total = 0
+    print(f"📋 Files that would be packaged from {skill_path.name}:")
+    for file_path, arcname in files:
+        size = file_path.stat().st_size
+        total += size
+        print(f"   {size:>12,}  {arcname}")
+    print(f"   {total:>12,}  total in {len(files)} files")
+
+    if excluded:
+        print(f"\n🚫 Excluded by .skillignore or defaults ({len(excluded)}):")
+        for path in sorted(excluded):
+            print(f"   {skill_path.name}/{path}")
+    return True
+
+
+def _package_one(skill_path, output_dir, options):
+    """Package one skill in a worker process, collecting its output in a JsonReporter"""
+    reporter = JsonReporter(emit=False)
+    try:
+        package_skill(skill_path, output_dir, reporter=reporter, **options)
+    except Exception as e:
+        return {"skill": skill_path.name, "path": str(skill_path), "status": "failed", "error": f"❌ Error: {e}"}
+    result = reporter.result
+    del result["messages"], result["errors"]
+    return result
+
+
+def package_all(skills_root, output_dir=None, jobs=None, **options):
+    """
+    Validate and package every skill under skills_root across a process pool.
+
+    A failure in one skill (validation error, unreadable file, crashed worker)
+    is recorded in its result and does not stop the others.
+
+    Args:
+        skills_root: Folder to search for skills (see discover_skills)
+        output_dir: Output directory for the .skill files (defaults to current directory)
+        jobs: Number of worker processes (defaults to the CPU count)
+        **options: Passed to package_skill (workers, incremental, policy, deterministic, index)
+
+    Returns:
+        List of per-skill result dicts, in skill order
+    """
+    skills = discover_skills(skills_root)
+    if options.get("workers") is None:
+        options["workers"] = 1  # parallelism comes from the process pool
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_package_one, skill, output_dir, options) for skill in skills]
+        results = []
+        for skill, future in zip(skills, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"skill": skill.name, "path": str(skill), "status": "failed", "error": str(e)})
+    return results
+
+
+def print_summary(results, elapsed):
+    """Print one row per skill (status, files, size, archive size, ratio, time) and totals"""
+    print(f"{'skill':<32} {'status':>7} {'files':>7} {'size':>14} {'archive':>14} {'ratio':>6} {'s':>7}")
+    for result in results:
+        if result["status"] == "ok":
+            archive_size = f"{result['archive_size']:,}" if result["archive_size"] is not None else "-"
+            ratio = f"{result['ratio']:.1%}" if result["ratio"] is not None else "-"
+            print(f"{result['skill'][:32]:<32} {'ok':>7} {result['files']:>7,} {result['size']:>14,} "
+                  f"{archive_size:>14} {ratio:>6} {result['seconds']:>7.2f}")
+        else:
+            print(f"{result['skill'][:32]:<32} {'failed':>7} {'':>7} {'':>14} {'':>14} {'':>6} "
+                  f"{result.get('seconds', 0):>7.2f}")
+            print(f"   {result['error']}")
+    failed = sum(1 for result in results if result["status"] != "ok")
+    print(f"\n{len(results) - failed} packaged, {failed} failed in {elapsed:.2f} s")
+
+
+def format_compression_report(members):
+    """Format method, sizes, bytes saved and compression time for each member, then totals"""
+    lines = [f"\n   {'file':<48} {'method':>7} {'size':>12} {'saved':>12} {'ratio':>6} {'ms':>8}"]
+    for member in members:
+        saved = member.size - member.compressed_size
+        ratio = member.compressed_size / member.size if member.size else 1.0
+        method = 'reused' if member.reused else METHOD_NAMES[member.compress_type]
+        lines.append(f"   {member.arcname[-48:]:<48} {method:>7} {member.size:>12,} {saved:>12,} "
+                     f"{ratio:>6.1%} {member.elapsed * 1e3:>8.1f}")
+    size = sum(member.size for member in members)
+    compressed = sum(member.compressed_size for member in members)
+    elapsed = sum(member.elapsed for member in members)
+    lines.append(f"   {'total':<48} {'':>7} {size:>12,} {size - compressed:>12,} "
+                 f"{compressed / size if size else 1.0:>6.1%} {elapsed * 1e3:>8.1f}")
+    return "\n".join(lines)
+
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python utils/package_skill.py <path/to/skill-folder> [output-directory]")
-        print("\nExample:")
-        print("  python utils/package_skill.py skills/public/my-skill")
-        print("  python utils/package_skill.py skills/public/my-skill ./dist")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Package a skill folder into a distributable .skill file",
+        epilog="Example:\n"
+               "  python utils/package_skill.py skills/public/my-skill\n"
+               "  python utils/package_skill.py skills/public/my-skill ./dist",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("skill_path", nargs="?", help="Path to the skill folder")
+    parser.add_argument("output_dir", nargs="?",
+                        help='Output directory (defaults to current directory), or "-" to write to stdout')
+    parser.add_argument("--workers", type=int, help="Compression threads (defaults to the CPU count)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Copy files unchanged since the previous build from the existing .skill file")
+    parser.add_argument("--level", type=int, default=-1, choices=range(-1, 10), metavar="N",
+                        help="Deflate level for binary files (default: zlib default)")
+    parser.add_argument("--text-level", type=int, choices=range(-1, 10), metavar="N",
+                        help="Deflate level for text files (defaults to --level)")
+    parser.add_argument("--lzma", action="store_true",
+                        help="Compress text files with LZMA (smaller, but not every unzip tool reads it)")
+    parser.add_argument("--report", action="store_true", help="Report bytes saved and time spent per file")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="List the files that would be packaged, with sizes, without writing anything")
+    parser.add_argument("--max-file-size", type=parse_size, metavar="SIZE",
+                        help="Fail if any file is larger than SIZE (e.g. 100M)")
+    parser.add_argument("--max-total-size", type=parse_size, metavar="SIZE",
+                        help="Fail if the skill's files add up to more than SIZE (e.g. 2G)")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Do not write the leading skill-index.jsonl member")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="Byte-identical output: fixed timestamps (SOURCE_DATE_EPOCH or 1980-01-01) and modes")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Validate from scratch instead of reusing cached results for an unchanged SKILL.md")
+    parser.add_argument("--all", metavar="SKILLS_ROOT",
+                        help="Package every folder containing SKILL.md under SKILLS_ROOT, in parallel")
+    parser.add_argument("--jobs", type=int, help="Worker processes for --all (defaults to the CPU count)")
+    parser.add_argument("--summary-json", metavar="FILE", help="With --all, write per-skill results to FILE")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--verbose", action="store_true", help="List every file packaged")
+    output.add_argument("--quiet", action="store_true", help="Print errors only")
+    output.add_argument("--progress", action="store_true",
+                        help="Show a single-line progress indicator with throughput on stderr")
+    output.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
 
-    skill_path = sys.argv[1]
-    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    skill_path = args.skill_path
+    output_dir = args.output_dir
+    policy = CompressionPolicy(args.level, args.text_level, ZIP_LZMA if args.lzma else ZIP_DEFLATED)
 
-    print(f"📦 Packaging skill: {skill_path}")
-    if output_dir:
-        print(f"   Output directory: {output_dir}")
-    print()
+    if args.all:
+        # With --all the only positional argument is the output directory
+        if skill_path and output_dir:
+            parser.error("--all takes at most one positional argument (the output directory)")
+        output_dir = output_dir or skill_path
+        if output_dir == "-" or args.dry_run:
+            parser.error("--all cannot be combined with streaming to stdout or --dry-run")
+
+        reporter = QuietReporter() if args.quiet or args.json else ConsoleReporter()
+        reporter.info(f"📦 Packaging all skills under: {args.all}")
+        if output_dir:
+            reporter.info(f"   Output directory: {output_dir}")
+        reporter.info("")
+        start = time.perf_counter()
+        results = package_all(args.all, output_dir, args.jobs, workers=args.workers, incremental=args.incremental,
+                              policy=policy, deterministic=args.deterministic, index=not args.no_index,
+                              max_file_size=args.max_file_size, max_total_size=args.max_total_size,
+                              cache=not args.no_cache)
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        elif args.quiet:
+            for result in results:
+                if result["status"] != "ok":
+                    reporter.error(f"{result['skill']}: {result['error']}")
+        else:
+            print_summary(results, time.perf_counter() - start)
+        if args.summary_json:
+            Path(args.summary_json).write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        sys.exit(0 if results and all(result["status"] == "ok" for result in results) else 1)
+
+    if not skill_path:
+        parser.error("the skill_path argument is required")
+
+    if args.dry_run:
+        sys.exit(0 if dry_run(skill_path) else 1)
+
+    if args.quiet:
+        reporter = QuietReporter()
+    elif args.progress:
+        reporter = ProgressReporter()
+    elif args.json:
+        reporter = JsonReporter()
+    else:
+        reporter = ConsoleReporter(verbose=args.verbose)
+
+    if output_dir == "-":
+        # The archive goes to stdout, so status messages go to stderr
+        stdout = sys.stdout.buffer
+        with redirect_stdout(sys.stderr):
+            reporter.info(f"📦 Packaging skill: {skill_path}\n")
+            result = package_skill(skill_path, None, args.workers, args.incremental, policy, args.report,
+                                   args.deterministic, fileobj=stdout, reporter=reporter, index=not args.no_index,
+                                   max_file_size=args.max_file_size, max_total_size=args.max_total_size,
+                                   cache=not args.no_cache)
+    else:
+        reporter.info(f"📦 Packaging skill: {skill_path}")
+        if output_dir:
+            reporter.info(f"   Output directory: {output_dir}")
+        reporter.info("")
 
-    result = package_skill(skill_path, output_dir)
+        result = package_skill(skill_path, output_dir, args.workers, args.incremental, policy, args.report,
+                               args.deterministic, reporter=reporter, index=not args.no_index,
+                               max_file_size=args.max_file_size, max_total_size=args.max_total_size,
+                               cache=not args.no_cache)
 
     if result:
         sys.exit(0)
@@ -1,14 +1,35 @@
 #!/usr/bin/env python3
 """
 Quick validation script for skills - minimal version
+
+Usage:
+    python quick_validate.py <skill_directory> [--no-cache] [--deep]
+    python quick_validate.py --all <skills_root> [--jobs N] [--json] [--junit FILE] [--no-cache] [--deep]
+
+With --all, every skill folder under skills_root is validated in one
+interpreter, spread over a pool of worker processes.
+
+--deep also checks each skill's files (see skill_resources.py): links and
+script references in SKILL.md, permissions of scripts it runs, and size
+budgets (--max-file-size, --max-total-size, --max-skill-md-lines).
+
+Results are cached by SKILL.md content (see ValidationCache), so unchanged
+skills are not parsed again. --no-cache validates everything from scratch.
 """
 
+import json
 import sys
 import os
 import re
-import yaml
+import time
 from pathlib import Path
 
+from frontmatter import FrontmatterError, read_frontmatter
+
+# Everything else (argparse, hashlib, tempfile, skill_ignore, skill_resources) is
+# imported where it is used: validating one skill should cost little more than
+# starting the interpreter.
+
 def validate_skill(skill_path):
     """Basic validation of a skill"""
     skill_path = Path(skill_path)
@@ -18,25 +39,11 @@ def validate_skill(skill_path):
     if not skill_md.exists():
         return False, "SKILL.md not found"
 
-    # Read and validate frontmatter
-    content = skill_md.read_text()
-    if not content.startswith('---'):
-        return False, "No YAML frontmatter found"
-
-    # Extract frontmatter
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
-        return False, "Invalid frontmatter format"
-
-    frontmatter_text = match.group(1)
-
-    # Parse YAML frontmatter
+    # Read and parse frontmatter (the body is never read)
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
-        if not isinstance(frontmatter, dict):
-            return False, "Frontmatter must be a YAML dictionary"
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML in frontmatter: {e}"
+        frontmatter = read_frontmatter(skill_md)
+    except FrontmatterError as e:
+        return False, str(e)
 
     # Define allowed properties
     ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
@@ -85,11 +92,386 @@ def validate_skill(skill_path):
 
     return True, "Skill is valid!"
 
+def _validator_key():
+    """Checksum of the validator's own source, so the cache is dropped whenever the rules change"""
+    # CRC-32 only has to notice edits, and zlib imports in a fraction of hashlib's time
+    import zlib
+
+    crc = 0
+    for name in ('quick_validate.py', 'frontmatter.py'):
+        crc = zlib.crc32((Path(__file__).parent / name).read_bytes(), crc)
+    return f'{crc:08x}'
+
+
+def default_cache_path():
+    """$SKILL_VALIDATE_CACHE, or validate-cache.json in the user's cache directory"""
+    if os.environ.get('SKILL_VALIDATE_CACHE'):
+        return Path(os.environ['SKILL_VALIDATE_CACHE'])
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA') or Path.home() / '.cache'
+    return Path(cache_home) / 'skill-creator' / 'validate-cache.json'
+
+
+class _FileLock:
+    """
+    Exclusive lock on a file for the duration of a with block.
+
+    Serializes the cache's read-merge-write across processes, such as
+    package_skill.py --all workers or two validators running at once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._unlock = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'a+b')
+        try:
+            try:
+                import fcntl
+            except ImportError:  # Windows
+                import msvcrt
+
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                self._unlock = lambda: msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+                self._unlock = lambda: fcntl.flock(self._file, fcntl.LOCK_UN)
+        except BaseException:
+            self._file.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self._file.seek(0)
+            self._unlock()
+        finally:
+            self._file.close()
+
+
+class ValidationCache:
+    """
+    Persistent validate_skill results, keyed by the SHA-256 of SKILL.md.
+
+    A SKILL.md whose size and mtime match the last run is not even re-hashed;
+    one that changed is hashed and looked up by content, so copies and moved
+    skills still hit. The whole cache is discarded when quick_validate.py or
+    frontmatter.py change, and save() forgets SKILL.md paths that are gone.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_cache_path()
+        self._key = None
+        self.files = {}
+        self.results = {}
+        self.seen = set()
+        self.hits = 0
+        self._dirty = False
+        try:
+            cache = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if cache.get('version') == 1 and cache.get('validator') == self.key:
+            self.files = cache.get('files', {})
+            self.results = cache.get('results', {})
+
+    @property
+    def key(self):
+        """_validator_key(), computed once there is a cache file to check or write"""
+        if self._key is None:
+            self._key = _validator_key()
+        return self._key
+
+    def _digest(self, skill_md):
+        """SHA-256 of skill_md, reusing the recorded one if its size and mtime are unchanged"""
+        st = os.stat(skill_md)
+        self.seen.add(str(skill_md))
+        entry = self.files.get(str(skill_md))
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha256']
+        import hashlib
+
+        digest = hashlib.sha256()
+        with open(skill_md, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        self.files[str(skill_md)] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+        self._dirty = True
+        return sha256
+
+    def get(self, skill_path):
+        """
+        Look up a skill.
+
+        Returns:
+            (valid, message) from an earlier validation of the same SKILL.md, or None
+        """
+        try:
+            result = self.results.get(self._digest(Path(skill_path).resolve() / 'SKILL.md'))
+        except OSError:
+            return None
+        if result is not None:
+            self.hits += 1
+            return tuple(result)
+        return None
+
+    def put(self, skill_path, valid, message):
+        """Record the result of validating a skill"""
+        try:
+            sha256 = self._digest(Path(skill_path).resolve() / 'SKILL.md')
+        except OSError:
+            return
+        self.results[sha256] = [valid, message]
+        self._dirty = True
+
+    def validate(self, skill_path):
+        """validate_skill, answered from the cache when SKILL.md is unchanged"""
+        result = self.get(skill_path)
+        if result is None:
+            result = validate_skill(skill_path)
+            self.put(skill_path, *result)
+        return result
+
+    def _stale(self, files, root):
+        """Recorded paths not seen in this run that no longer exist, or that lie under root"""
+        prefix = os.path.join(Path(root).resolve(), '') if root is not None else None
+        return [path for path in files
+                if path not in self.seen and ((prefix and path.startswith(prefix)) or not os.path.isfile(path))]
+
+    def save(self, root=None):
+        """
+        Write the cache if anything changed, merged with entries other processes
+        saved meanwhile. The merge runs under a lock on a .lock file next to the
+        cache, so concurrent saves do not lose each other's entries.
+
+        Files not looked up in this run are dropped if their SKILL.md is gone,
+        or if they lie under root, a folder this run searched completely (so
+        moved, deleted and newly ignored skills are forgotten). Results no
+        remaining file refers to are dropped too, so the cache does not grow
+        past the skills that exist.
+
+        Args:
+            root: Folder whose skills were all looked up in this run (as by validate_all)
+        """
+        if not self._dirty and not self._stale(self.files, root):
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with _FileLock(self.path.with_name(self.path.name + '.lock')):
+                self._merge_and_write(root)
+        except OSError:
+            pass  # an unwritable cache only costs speed
+        self._dirty = False
+
+    def _merge_and_write(self, root):
+        import tempfile
+
+        files, results = {}, {}
+        try:
+            cache = json.loads(self.path.read_text())
+            if cache.get('version') == 1 and cache.get('validator') == self.key:
+                files, results = cache.get('files', {}), cache.get('results', {})
+        except (OSError, ValueError):
+            pass
+        # Entries this run did not look up are only copies of what was on disk when it
+        # started; the file's current ones may be newer
+        files.update((path, entry) for path, entry in self.files.items() if path in self.seen)
+        for path in self._stale(files, root):
+            del files[path]
+        self.files = files
+        referenced = {entry['sha256'] for entry in files.values()}
+        results.update(self.results)
+        self.results = results = {sha256: result for sha256, result in results.items() if sha256 in referenced}
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name + '.', dir=self.path.parent)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'version': 1, 'validator': self.key, 'files': files, 'results': results}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _validate_one(skill_path, cached=None, deep=None):
+    """
+    Validate one skill and time it.
+
+    Args:
+        skill_path: Path to the skill folder
+        cached: (valid, message) from the ValidationCache, if it had the skill
+        deep: Keyword arguments for skill_resources.check_resources, or None to skip it
+    """
+    start = time.perf_counter()
+    problems = []
+    try:
+        valid, message = cached or validate_skill(skill_path)
+        if valid and deep is not None:
+            from skill_resources import check_resources
+
+            problems = check_resources(skill_path, **deep)
+    except Exception as e:
+        valid, message = False, f"Validator error: {e}"
+    return {"skill": skill_path.name, "path": str(skill_path), "valid": valid and not problems, "message": message,
+            "problems": problems, "seconds": round(time.perf_counter() - start, 6), "cached": cached is not None}
+
+
+def validate_all(skills_root, jobs=None, cache=None, deep=None):
+    """
+    Validate every skill folder under skills_root.
+
+    Args:
+        skills_root: Folder to search for skills (see skill_ignore.discover_skills)
+        jobs: Number of worker processes (defaults to the CPU count; 1 validates in this process)
+        cache: Optional ValidationCache; skills found in it are not validated again
+        deep: Keyword arguments for skill_resources.check_resources (e.g. {} for the default
+            budgets) to also check each skill's links, scripts and sizes; these checks are
+            never cached
+
+    Returns:
+        List of result dicts (skill, path, valid, message, problems, seconds, cached), sorted by path.
+        message is the frontmatter check's; problems lists what the deep checks found.
+    """
+    from skill_ignore import discover_skills
+
+    skills = discover_skills(skills_root)
+    cached = {skill: cache.get(skill) for skill in skills} if cache else {}
+    results = {}
+    for skill in skills:
+        if cached.get(skill) is not None and deep is None:
+            valid, message = cached[skill]
+            results[skill] = {"skill": skill.name, "path": str(skill), "valid": valid, "message": message,
+                              "problems": [], "seconds": 0.0, "cached": True}
+    pending = [skill for skill in skills if skill not in results]
+    previous = [cached.get(skill) for skill in pending]
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(pending) < 2:
+        validated = [_validate_one(skill, result, deep) for skill, result in zip(pending, previous)]
+    else:
+        # Imported here: multiprocessing costs more startup time than validating one skill
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            validated = list(executor.map(_validate_one, pending, previous, [deep] * len(pending),
+                                          chunksize=max(1, len(pending) // (jobs * 4))))
+
+    for skill, result in zip(pending, validated):
+        results[skill] = result
+        if cache and not result["cached"] and not result["message"].startswith("Validator error"):
+            # Deep problems are only looked for once the frontmatter passed
+            cache.put(skill, result["valid"] or bool(result["problems"]), result["message"])
+    if cache:
+        cache.save(root=skills_root)
+    return [results[skill] for skill in skills]
+
+
+def junit_report(results, elapsed):
+    """
+    Render validation results as a JUnit XML document, one testcase per skill.
+
+    Returns:
+        The XML document as a string
+    """
+    import xml.etree.ElementTree as ET
+
+    failures = sum(1 for result in results if not result["valid"])
+    suite = ET.Element("testsuite", name="quick_validate", tests=str(len(results)), failures=str(failures),
+                       errors="0", time=f"{elapsed:.3f}")
+    for result in results:
+        case = ET.SubElement(suite, "testcase", classname="skills", name=result["skill"],
+                             file=result["path"], time=f"{result['seconds']:.6f}")
+        if not result["valid"]:
+            message = "; ".join(result["problems"]) or result["message"]
+            ET.SubElement(case, "failure", message=message)
+    return ET.tostring(suite, encoding="unicode", xml_declaration=True)
+
+
+def _check_one(skill_directory, cache=None, deep=None):
+    """Validate one skill folder and print the outcome; returns the exit code"""
+    if cache:
+        valid, message = cache.validate(skill_directory)
+        cache.save()
+    else:
+        valid, message = validate_skill(skill_directory)
+    problems = []
+    if valid and deep is not None:
+        from skill_resources import check_resources
+
+        problems = check_resources(skill_directory, **deep)
+    print(message if not problems else f"Found {len(problems)} problem(s):")
+    for problem in problems:
+        print(f"  {problem}")
+    return 0 if valid and not problems else 1
+
+
+def main():
+    if len(sys.argv) == 2 and not sys.argv[1].startswith('-'):
+        # The plain "quick_validate.py <skill_directory>" run skips argparse, which
+        # takes longer to import and set up than validating a cached skill
+        sys.exit(_check_one(sys.argv[1], ValidationCache()))
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate skill folders")
+    parser.add_argument("skill_directory", nargs="?", help="Skill folder to validate")
+    parser.add_argument("--all", metavar="SKILLS_ROOT", help="Validate every skill folder under SKILLS_ROOT")
+    parser.add_argument("--jobs", type=int, help="With --all, worker processes (defaults to the CPU count)")
+    parser.add_argument("--json", action="store_true", help="With --all, print the results as JSON")
+    parser.add_argument("--junit", metavar="FILE", help="With --all, also write a JUnit XML report to FILE")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore cached results and validate every skill")
+    parser.add_argument("--deep", action="store_true",
+                        help="Also check links and script references in SKILL.md, script permissions and sizes")
+    # Sizes are parsed with --deep only, so a plain run never imports skill_resources
+    parser.add_argument("--max-file-size", metavar="SIZE", help="With --deep, largest file allowed (default: 10M)")
+    parser.add_argument("--max-total-size", metavar="SIZE",
+                        help="With --deep, largest total of all files allowed (default: 50M)")
+    parser.add_argument("--max-skill-md-lines", type=int, metavar="N",
+                        help="With --deep, most lines allowed in SKILL.md (default: 500)")
+    args = parser.parse_args()
+
+    if bool(args.skill_directory) == bool(args.all):
+        parser.error("give either a skill directory or --all SKILLS_ROOT")
+    cache = None if args.no_cache else ValidationCache()
+    deep = None
+    if args.deep:
+        from skill_resources import (
+            DEFAULT_MAX_FILE_SIZE, DEFAULT_MAX_SKILL_MD_LINES, DEFAULT_MAX_TOTAL_SIZE, parse_size,
+        )
+
+        try:
+            deep = dict(
+                max_file_size=parse_size(args.max_file_size) if args.max_file_size else DEFAULT_MAX_FILE_SIZE,
+                max_total_size=parse_size(args.max_total_size) if args.max_total_size else DEFAULT_MAX_TOTAL_SIZE,
+                max_skill_md_lines=args.max_skill_md_lines or DEFAULT_MAX_SKILL_MD_LINES,
+            )
+        except ValueError as e:
+            parser.error(f"invalid size: {e}")
+
+    if args.skill_directory:
+        sys.exit(_check_one(args.skill_directory, cache, deep))
+
+    start = time.perf_counter()
+    results = validate_all(args.all, args.jobs, cache, deep)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if not result["valid"])
+
+    if args.json:
+        print(json.dumps({"skills": len(results), "failed": failed, "seconds": round(elapsed, 3),
+                          "results": results}, indent=2, ensure_ascii=False))
+    else:
+        for result in results:
+            if result["problems"]:
+                print(f"❌ {result['skill']}: {len(result['problems'])} problem(s)")
+                for problem in result["problems"]:
+                    print(f"   {problem}")
+            else:
+                print(f"{'✅' if result['valid'] else '❌'} {result['skill']}: {result['message']}")
+        cached = sum(1 for result in results if result["cached"])
+        print(f"\n{len(results) - failed} valid, {failed} invalid in {elapsed:.2f} s"
+              + (f" ({cached} from cache)" if cached else ""))
+    if args.junit:
+        Path(args.junit).write_text(junit_report(results, elapsed), encoding="utf-8")
+    sys.exit(0 if failed == 0 and results else 1)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python quick_validate.py <skill_directory>")
-        sys.exit(1)
-    
-    valid, message = validate_skill(sys.argv[1])
-    print(message)
-    sys.exit(0 if valid else 1)
\ No newline at end of file
+    main()
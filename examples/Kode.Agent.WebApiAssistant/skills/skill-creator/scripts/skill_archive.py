@@ -0,0 +1,793 @@
+#!/usr/bin/env python3
+"""
+Skill Archive - Zip writer used by package_skill.py
+
+Members are compressed ahead of time, in a thread pool (zlib releases the
+GIL), and then written as raw local-header + data records in a fixed order.
+The output is a standard zip file readable by zipfile and any unzip tool
+(LZMA members, which are opt-in, need a tool with LZMA support).
+
+The writer never seeks, so an archive can be streamed to a pipe or socket.
+Files over LARGE_FILE bytes are read and compressed in CHUNK_SIZE blocks and
+their compressed data is spooled to a temporary file (or, when stored, copied
+from the source at write time), so memory use does not grow with file size.
+Members and archives over 2 GB get ZIP64 extra fields and end records.
+
+Archives may start with a stored skill-index.jsonl member. Its first line
+holds the skill's name and frontmatter; each following line describes one
+file (size, hashes and byte offsets). A loader can read a skill's metadata
+with one small read at offset 0, and fetch any single file by offset
+without parsing the central directory (see read_index and read_indexed_file).
+The offsets follow from the sizes of the compressed members, so the writer
+holds members until close() rather than writing the archive twice; the cost
+is that nothing is output before the last member is compressed.
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import struct
+import tempfile
+import threading
+import time
+import unicodedata
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_LZMA = 14
+
+METHOD_NAMES = {ZIP_STORED: 'stored', ZIP_DEFLATED: 'deflate', ZIP_LZMA: 'lzma'}
+_VERSION_NEEDED = {ZIP_STORED: 10, ZIP_DEFLATED: 20, ZIP_LZMA: 63}
+
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP64_END_RECORD = struct.Struct('<4sQ2H2L4Q')
+_ZIP64_LOCATOR = struct.Struct('<4sLQL')
+
+# Same limits as zipfile: beyond these, ZIP64 fields are written
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+_ZIP64_VERSION = 45
+
+CHUNK_SIZE = 8 << 20
+LARGE_FILE = 16 << 20
+
+_UTF8_FLAG = 0x800
+_LZMA_EOS_FLAG = 0x02
+
+INDEX_NAME = 'skill-index.jsonl'
+INDEX_VERSION = 1
+
+# While an index is pending, compressed data beyond this many bytes, and
+# temporary files beyond this many, are moved into one shared spill file
+INDEX_BUFFER = 64 << 20
+INDEX_OPEN_SPOOLS = 64
+
+
+class SpooledData:
+    """
+    Compressed member data held in a file instead of memory: a byte range of a
+    path (a stored source file, or a previous archive), or a temporary file.
+    """
+
+    def __init__(self, length, path=None, fileobj=None, offset=0, crc=None, shared=False):
+        self.length = length
+        self.path = path
+        self.fileobj = fileobj
+        self.offset = offset
+        self.crc = crc
+        self.shared = shared  # fileobj holds other data too and is closed by its owner
+
+    def blocks(self, size=CHUNK_SIZE):
+        """
+        Yield the data in blocks of at most size bytes.
+
+        Raises:
+            ValueError: If crc is set and the data read does not match it
+                (the source file changed after it was hashed)
+        """
+        f = self.fileobj if self.fileobj is not None else open(self.path, 'rb')
+        try:
+            f.seek(self.offset)
+            remaining, crc = self.length, 0
+            while remaining:
+                block = f.read(min(size, remaining))
+                if not block:
+                    raise ValueError(f"{self.path or 'spool'} is shorter than expected")
+                if self.crc is not None:
+                    crc = zlib.crc32(block, crc)
+                remaining -= len(block)
+                yield block
+            if self.crc is not None and crc != self.crc:
+                raise ValueError(f"{self.path} changed while it was being packaged")
+        finally:
+            if f is not self.fileobj:
+                f.close()
+
+    def close(self):
+        if self.fileobj is not None and not self.shared:
+            self.fileobj.close()
+
+
+class ArchiveMember:
+    """A file compressed and ready to be written into an archive"""
+
+    def __init__(self, arcname, data, crc, size, compress_type, date_time, mode,
+                 sha256=None, mtime_ns=None, reused=False, elapsed=0.0, compressed_size=None):
+        self.arcname = arcname
+        self.data = data  # bytes or SpooledData
+        self.compressed_size = len(data) if compressed_size is None else compressed_size
+        self.crc = crc
+        self.size = size
+        self.compress_type = compress_type
+        self.date_time = date_time
+        self.mode = mode
+        self.sha256 = sha256
+        self.mtime_ns = mtime_ns
+        self.reused = reused
+        self.elapsed = elapsed
+        self.header_offset = None
+        self.data_offset = None
+
+    @property
+    def zip64(self):
+        return self.size > ZIP64_LIMIT or self.compressed_size > ZIP64_LIMIT
+
+    @property
+    def local_header_size(self):
+        """Bytes of the local header, name and extra field before the member's data"""
+        return _LOCAL_HEADER.size + len(self.arcname.encode('utf-8')) + (20 if self.zip64 else 0)
+
+    @property
+    def flags(self):
+        flags = _UTF8_FLAG if not self.arcname.isascii() else 0
+        if self.compress_type == ZIP_LZMA:
+            flags |= _LZMA_EOS_FLAG
+        return flags
+
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time[:6]
+    return ((year - 1980) << 9) | (month << 5) | day, (hour << 11) | (minute << 5) | (second // 2)
+
+
+def _compressor(compress_type, level):
+    """Return (prefix bytes, compressor object) for a member compressed with compress_type"""
+    if compress_type == ZIP_LZMA:
+        # Same member layout as zipfile: version 9.4, filter properties, raw LZMA1 stream
+        props = lzma._encode_filter_properties({'id': lzma.FILTER_LZMA1})
+        compressor = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=[
+            lzma._decode_filter_properties(lzma.FILTER_LZMA1, props),
+        ])
+        return struct.pack('<BBH', 9, 4, len(props)) + props, compressor
+    return b'', zlib.compressobj(level, zlib.DEFLATED, -15)
+
+
+def _compress(data, compress_type, level):
+    prefix, compressor = _compressor(compress_type, level)
+    return prefix + compressor.compress(data) + compressor.flush()
+
+
+class CompressionPolicy:
+    """
+    Chooses how each file is compressed.
+
+    - Files with an already-compressed extension (images, archives, parquet...) are stored.
+    - Other large binary files are probed: if deflating their first 64 KB at level 1
+      saves less than 5%, they are stored without compressing the rest.
+    - Text files use text_method at text_level; everything else is deflated at level.
+    - A member is always stored if compression would not make it smaller.
+    """
+
+    STORED_EXTENSIONS = frozenset({
+        '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+        '.zip', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.7z', '.rar', '.skill', '.jar', '.whl',
+        '.parquet', '.feather', '.npz',
+        '.mp3', '.mp4', '.m4a', '.ogg', '.webm', '.mov',
+        '.woff', '.woff2',
+    })
+    TEXT_EXTENSIONS = frozenset({
+        '.md', '.txt', '.rst', '.py', '.js', '.ts', '.cs', '.sh', '.ps1',
+        '.json', '.jsonl', '.yaml', '.yml', '.toml', '.xml', '.html', '.css', '.csv', '.svg',
+    })
+    PROBE_SIZE = 64 * 1024
+    PROBE_RATIO = 0.95
+
+    def __init__(self, level=zlib.Z_DEFAULT_COMPRESSION, text_level=None, text_method=ZIP_DEFLATED,
+                 stored_extensions=None, probe=True):
+        """
+        Args:
+            level: zlib level for files that are neither text nor stored
+            text_level: zlib level for text files (defaults to level)
+            text_method: ZIP_DEFLATED or ZIP_LZMA for text files
+            stored_extensions: Extensions to store uncompressed (defaults to STORED_EXTENSIONS)
+            probe: Trial-compress the start of unknown binary files
+        """
+        if text_method not in (ZIP_DEFLATED, ZIP_LZMA):
+            raise ValueError(f"Unsupported text compression method: {text_method}")
+        self.level = level
+        self.text_level = level if text_level is None else text_level
+        self.text_method = text_method
+        self.stored_extensions = self.STORED_EXTENSIONS if stored_extensions is None else frozenset(stored_extensions)
+        self.probe = probe
+
+    @property
+    def key(self):
+        """String identifying the policy; members built under another policy are not reused"""
+        return (f"level={self.level},text={METHOD_NAMES[self.text_method]}:{self.text_level},"
+                f"probe={int(self.probe)},stored={','.join(sorted(self.stored_extensions))}")
+
+    def _extension(self, arcname):
+        name = arcname.rsplit('/', 1)[-1].lower()
+        dot = name.find('.')
+        while dot != -1:
+            if name[dot:] in self.stored_extensions or name[dot:] in self.TEXT_EXTENSIONS:
+                return name[dot:]
+            dot = name.find('.', dot + 1)
+        return ''
+
+    def choose(self, arcname, sample, size):
+        """
+        Choose the method for a file from its name and first PROBE_SIZE bytes.
+
+        Returns:
+            (compress_type, level)
+        """
+        extension = self._extension(arcname)
+        if extension in self.stored_extensions:
+            return ZIP_STORED, None
+        if extension in self.TEXT_EXTENSIONS:
+            return self.text_method, self.text_level
+        if self.probe and size > self.PROBE_SIZE:
+            if len(_compress(sample, ZIP_DEFLATED, 1)) > len(sample) * self.PROBE_RATIO:
+                return ZIP_STORED, None
+        return ZIP_DEFLATED, self.level
+
+    def compress(self, arcname, data):
+        """
+        Compress one file's contents.
+
+        Returns:
+            (compress_type, compressed bytes)
+        """
+        method, level = self.choose(arcname, data[:self.PROBE_SIZE], len(data))
+        if method == ZIP_STORED:
+            return ZIP_STORED, data
+        compressed = _compress(data, method, level)
+        if len(compressed) >= len(data):
+            return ZIP_STORED, data
+        return method, compressed
+
+
+DEFAULT_POLICY = CompressionPolicy()
+
+
+def _compress_large_file(file_path, arcname, size, policy):
+    """
+    Compress a file in CHUNK_SIZE blocks, spooling the output to a temporary file.
+
+    Returns:
+        (compress_type, SpooledData, crc, size, sha256 hex)
+    """
+    buffer = bytearray(CHUNK_SIZE)
+    view = memoryview(buffer)
+    crc, digest, total = 0, hashlib.sha256(), 0
+    with open(file_path, 'rb') as f:
+        compress_type, level = policy.choose(arcname, f.read(policy.PROBE_SIZE), size)
+        f.seek(0)
+        spool = None
+        if compress_type != ZIP_STORED:
+            prefix, compressor = _compressor(compress_type, level)
+            spool = tempfile.TemporaryFile()
+            spool.write(prefix)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            chunk = view[:n]
+            crc = zlib.crc32(chunk, crc)
+            digest.update(chunk)
+            if spool is not None:
+                spool.write(compressor.compress(chunk))
+            total += n
+
+    if spool is not None:
+        spool.write(compressor.flush())
+        compressed_size = spool.tell()
+        if compressed_size < total:
+            return compress_type, SpooledData(compressed_size, fileobj=spool), crc, total, digest.hexdigest()
+        spool.close()
+    # Stored: copied from the source when written, checked against this CRC
+    return ZIP_STORED, SpooledData(total, path=file_path, crc=crc), crc, total, digest.hexdigest()
+
+
+def compress_file(file_path, arcname, policy=DEFAULT_POLICY):
+    """
+    Read and compress one file.
+
+    Files over LARGE_FILE bytes are streamed in CHUNK_SIZE blocks rather than
+    read whole, so memory use stays bounded.
+
+    Args:
+        file_path: Path of the file to read
+        arcname: Name of the member inside the archive
+        policy: CompressionPolicy choosing the method for this file
+
+    Returns:
+        ArchiveMember holding the compressed data
+    """
+    start = time.perf_counter()
+    st = os.stat(file_path)
+    if st.st_size > LARGE_FILE:
+        compress_type, compressed, crc, size, digest = _compress_large_file(file_path, arcname, st.st_size, policy)
+    else:
+        data = Path(file_path).read_bytes()
+        compress_type, compressed = policy.compress(arcname, data)
+        crc, size, digest = zlib.crc32(data), len(data), hashlib.sha256(data).hexdigest()
+    date_time = time.localtime(st.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    return ArchiveMember(
+        arcname=arcname,
+        data=compressed,
+        compressed_size=compressed.length if isinstance(compressed, SpooledData) else len(compressed),
+        crc=crc,
+        size=size,
+        compress_type=compress_type,
+        date_time=date_time,
+        mode=st.st_mode,
+        sha256=digest,
+        mtime_ns=st.st_mtime_ns,
+        elapsed=time.perf_counter() - start,
+    )
+
+
+def file_sha256(file_path):
+    """Return the hex SHA-256 of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _build_member(file_path, arcname, policy, reuse):
+    if reuse is not None:
+        member = reuse(file_path, arcname)
+        if member is not None:
+            return member
+    return compress_file(file_path, arcname, policy)
+
+
+def compress_files(files, workers=None, policy=DEFAULT_POLICY, reuse=None):
+    """
+    Compress files in a thread pool, yielding members in input order.
+
+    At most a small window of members is kept in flight, so memory use is
+    bounded by the window rather than the size of the skill.
+
+    Args:
+        files: Iterable of (file_path, arcname) pairs
+        workers: Number of compression threads (defaults to the CPU count)
+        policy: CompressionPolicy choosing the method for each file
+        reuse: Optional callable(file_path, arcname) returning an already compressed
+            ArchiveMember (e.g. PreviousBuild.reuse), or None to compress the file
+
+    Yields:
+        ArchiveMember for each file, in the order given
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file_path, arcname in files:
+            pending.append(executor.submit(_build_member, file_path, arcname, policy, reuse))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def normalize_arcname(arcname):
+    """Use forward slashes and NFC Unicode, so names do not depend on the build platform"""
+    return unicodedata.normalize('NFC', arcname.replace('\\', '/'))
+
+
+def reproducible_date_time():
+    """Timestamp for reproducible archives: SOURCE_DATE_EPOCH if set, else 1980-01-01"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        date_time = time.gmtime(int(epoch))[:6]
+        if date_time[0] >= 1980:
+            return date_time
+    return (1980, 1, 1, 0, 0, 0)
+
+
+class SkillArchiveWriter:
+    """
+    Writes pre-compressed members and the central directory to a binary file object.
+
+    With deterministic=True every member gets the same timestamp and a mode of
+    0644 (0755 if any execute bit is set), so the same inputs always produce
+    byte-identical archives. Members must then be written in sorted order.
+
+    With index set to a dict of skill metadata (e.g. {'frontmatter': {...}}),
+    members are held until close(), which writes a stored skill-index.jsonl
+    first and the members after it. Their compressed sizes fix every offset in
+    the index, so the archive is written once. Held data stays in memory up to
+    INDEX_BUFFER bytes; beyond that small members, and large members' temporary
+    files past INDEX_OPEN_SPOOLS, are moved to a spill file. Stored large files
+    and reused members are read from their source when written.
+    """
+
+    def __init__(self, fileobj, deterministic=False, index=None):
+        self.members = []
+        self.offset = 0
+        self.date_time = reproducible_date_time() if deterministic else None
+        self.index = index
+        self.index_member = None
+        self.fileobj = fileobj
+        self._held_bytes = 0
+        self._held_spools = 0
+        self._spill = None
+
+    def _write(self, data):
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def write(self, member):
+        """Append one member (local header followed by its compressed data), or hold it for the index"""
+        if self.date_time is not None:
+            if self.members and member.arcname <= self.members[-1].arcname:
+                raise ValueError(f"Members must be written in sorted order: {member.arcname}")
+            member.date_time = self.date_time
+            member.mode = 0o100755 if member.mode & 0o111 else 0o100644
+        if self.index is not None:
+            self._hold(member)
+        else:
+            self._write_member(member)
+        self.members.append(member)
+
+    def _hold(self, member):
+        """Keep a member's data until close(), spilling it once the buffer limits are reached"""
+        data = member.data
+        if isinstance(data, SpooledData):
+            if data.fileobj is None or data.shared:
+                return  # read from its source file when written
+            self._held_spools += 1
+            if self._held_spools <= INDEX_OPEN_SPOOLS:
+                return
+        elif self._held_bytes + len(data) <= INDEX_BUFFER:
+            self._held_bytes += len(data)
+            return
+
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile()
+        offset = self._spill.seek(0, os.SEEK_END)
+        if isinstance(data, SpooledData):
+            for block in data.blocks():
+                self._spill.write(block)
+            data.close()
+        else:
+            self._spill.write(data)
+        member.data = SpooledData(member.compressed_size, fileobj=self._spill, offset=offset, shared=True)
+
+    def _write_member(self, member):
+        name = member.arcname.encode('utf-8')
+        dos_date, dos_time = _dos_date_time(member.date_time)
+        version = _VERSION_NEEDED[member.compress_type]
+        size, compressed_size, extra = member.size, member.compressed_size, b''
+        if member.zip64:
+            extra = struct.pack('<HHQQ', 1, 16, member.size, member.compressed_size)
+            size = compressed_size = 0xFFFFFFFF
+            version = max(version, _ZIP64_VERSION)
+        member.header_offset = self.offset
+        self._write(_LOCAL_HEADER.pack(
+            b'PK\x03\x04', version, 0, member.flags, member.compress_type, dos_time, dos_date,
+            member.crc, compressed_size, size, len(name), len(extra),
+        ))
+        self._write(name)
+        self._write(extra)
+        member.data_offset = self.offset
+        if isinstance(member.data, SpooledData):
+            for block in member.data.blocks():
+                self._write(block)
+            member.data.close()
+        else:
+            self._write(member.data)
+        member.data = None  # free the payload once written
+
+    def _index_data(self, shift):
+        def line(value):
+            return json.dumps(value, separators=(',', ':'), ensure_ascii=False, default=str)
+
+        header = dict(self.index, version=INDEX_VERSION, files=len(self.members),
+                      size=sum(member.size for member in self.members))
+        lines = [line(header)]
+        for member in self.members:
+            offset = member.header_offset + shift
+            lines.append(line({
+                'path': member.arcname,
+                'size': member.size,
+                'compressed_size': member.compressed_size,
+                'method': METHOD_NAMES[member.compress_type],
+                'crc32': member.crc,
+                'sha256': member.sha256,
+                'offset': offset,
+                'data_offset': member.data_offset + shift,
+            }))
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def _write_index(self):
+        """Write the index member, then the held members after it"""
+        # Lay the members out relative to the end of the index
+        offset = 0
+        for member in self.members:
+            member.header_offset = offset
+            member.data_offset = offset + member.local_header_size
+            offset = member.data_offset + member.compressed_size
+
+        # Offsets in the index depend on the index's own length: iterate to a fixed point
+        # (the length only grows with the offsets, so this settles in a few rounds)
+        header_size = _LOCAL_HEADER.size + len(INDEX_NAME)
+        data = b''
+        while True:
+            shift = header_size + len(data)
+            updated = self._index_data(shift)
+            if len(updated) == len(data):
+                break
+            data = updated
+        data = updated
+
+        self.index_member = ArchiveMember(
+            arcname=INDEX_NAME,
+            data=data,
+            crc=zlib.crc32(data),
+            size=len(data),
+            compress_type=ZIP_STORED,
+            date_time=self.date_time or time.localtime()[:6],
+            mode=0o100644,
+            sha256=hashlib.sha256(data).hexdigest(),
+        )
+        self._write_member(self.index_member)
+
+        try:
+            for member in self.members:
+                expected = member.header_offset + shift
+                self._write_member(member)
+                if member.header_offset != expected:
+                    raise RuntimeError(f"Index offset of {member.arcname} does not match the archive")
+        finally:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def close(self):
+        """Write the index (if any), the central directory and end record"""
+        if self.index is not None:
+            self._write_index()
+        members = [self.index_member] + self.members if self.index_member else self.members
+        start = self.offset
+        for member in members:
+            name = member.arcname.encode('utf-8')
+            version = _VERSION_NEEDED[member.compress_type]
+            dos_date, dos_time = _dos_date_time(member.date_time)
+            size, compressed_size, header_offset = member.size, member.compressed_size, member.header_offset
+            zip64 = []
+            if member.zip64:
+                zip64 += [size, compressed_size]
+                size = compressed_size = 0xFFFFFFFF
+            if header_offset > ZIP64_LIMIT:
+                zip64.append(header_offset)
+                header_offset = 0xFFFFFFFF
+            extra = struct.pack(f'<HH{len(zip64)}Q', 1, 8 * len(zip64), *zip64) if zip64 else b''
+            if zip64:
+                version = max(version, _ZIP64_VERSION)
+            self._write(_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', max(version, 20), 3, version, 0, member.flags, member.compress_type,
+                dos_time, dos_date,
+                member.crc, compressed_size, size, len(name), len(extra), 0, 0, 0,
+                (member.mode & 0xFFFF) << 16, header_offset,
+            ))
+            self._write(name)
+            self._write(extra)
+
+        count, size = len(members), self.offset - start
+        if count > ZIP_FILECOUNT_LIMIT or size > ZIP64_LIMIT or start > ZIP64_LIMIT:
+            zip64_end = self.offset
+            self._write(_ZIP64_END_RECORD.pack(
+                b'PK\x06\x06', _ZIP64_END_RECORD.size - 12, _ZIP64_VERSION, _ZIP64_VERSION, 0, 0,
+                count, count, size, start,
+            ))
+            self._write(_ZIP64_LOCATOR.pack(b'PK\x06\x07', 0, zip64_end, 1))
+            count, size, start = min(count, 0xFFFF), min(size, 0xFFFFFFFF), min(start, 0xFFFFFFFF)
+        self._write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, count, count, size, start, 0))
+
+
+def manifest_path_for(archive_path):
+    """Manifest file kept next to a .skill archive"""
+    archive_path = Path(archive_path)
+    return archive_path.with_name(archive_path.name + '.manifest.json')
+
+
+def write_manifest(manifest_path, members, policy=DEFAULT_POLICY):
+    """
+    Record path, size, mtime and content hash of every member of a finished archive.
+    """
+    files = {
+        member.arcname: {
+            'size': member.size,
+            'mtime_ns': member.mtime_ns,
+            'sha256': member.sha256,
+            'crc': member.crc,
+            'compressed_size': member.compressed_size,
+            'compress_type': member.compress_type,
+            'date_time': list(member.date_time),
+            'mode': member.mode,
+        }
+        for member in members
+    }
+    tmp_path = Path(str(manifest_path) + '.tmp')
+    tmp_path.write_text(json.dumps({'version': 1, 'policy': policy.key, 'files': files}, indent=1))
+    os.replace(tmp_path, manifest_path)
+
+
+class PreviousBuild:
+    """
+    A previous archive and its manifest, used to copy unchanged members verbatim.
+
+    A file is unchanged when its size and mtime match the manifest, or failing
+    that, when its SHA-256 does. Its compressed bytes are then read straight
+    from the previous archive instead of being recompressed. Nothing is reused
+    if the previous archive was built with a different compression policy.
+    """
+
+    def __init__(self, archive_path, manifest_path=None, policy=DEFAULT_POLICY):
+        manifest_path = manifest_path or manifest_path_for(archive_path)
+        self.entries = {}
+        self._archive = None
+        self._infos = {}
+        self._lock = threading.Lock()
+        try:
+            manifest = json.loads(Path(manifest_path).read_text())
+            self._archive = open(archive_path, 'rb')
+            self._infos = {info.filename: info for info in zipfile.ZipFile(self._archive).infolist()}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            self.close()
+            return
+        if manifest.get('version') == 1 and manifest.get('policy') == policy.key:
+            self.entries = manifest.get('files', {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+
+    def _read_raw(self, info):
+        """Compressed bytes of a member, or a SpooledData range of the archive for large members"""
+        with self._lock:
+            self._archive.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(self._archive.read(_LOCAL_HEADER.size))
+            data_offset = info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+            if info.compress_size > LARGE_FILE:
+                return SpooledData(info.compress_size, path=self._archive.name, offset=data_offset)
+            self._archive.seek(data_offset)
+            return self._archive.read(info.compress_size)
+
+    def reuse(self, file_path, arcname):
+        """Return the previous member for an unchanged file, or None"""
+        entry = self.entries.get(arcname)
+        info = self._infos.get(arcname)
+        if entry is None or info is None:
+            return None
+        if (info.CRC, info.compress_size, info.compress_type) != (
+                entry['crc'], entry['compressed_size'], entry['compress_type']):
+            return None
+
+        st = os.stat(file_path)
+        if st.st_size != entry['size']:
+            return None
+        if st.st_mtime_ns != entry['mtime_ns'] and file_sha256(file_path) != entry['sha256']:
+            return None
+
+        return ArchiveMember(
+            arcname=arcname,
+            data=self._read_raw(info),
+            compressed_size=entry['compressed_size'],
+            crc=entry['crc'],
+            size=entry['size'],
+            compress_type=entry['compress_type'],
+            date_time=tuple(entry['date_time']),
+            mode=entry['mode'],
+            sha256=entry['sha256'],
+            mtime_ns=st.st_mtime_ns,
+            reused=True,
+        )
+
+
+def read_index(archive, files=True):
+    """
+    Read the skill-index.jsonl member at the start of an archive.
+
+    The central directory is never touched. With files=False only the first
+    line (name and frontmatter) is read, typically a single 4 KB read.
+
+    Args:
+        archive: Path to a .skill file, or a binary file object opened on one
+        files: Also read the per-file entries into index['files']
+
+    Returns:
+        The index dict, or None if the archive does not start with an index
+    """
+    if not hasattr(archive, 'read'):
+        with open(archive, 'rb') as f:
+            return read_index(f, files)
+
+    archive.seek(0)
+    head = archive.read(4096)
+    if len(head) < _LOCAL_HEADER.size:
+        return None
+    header = _LOCAL_HEADER.unpack_from(head)
+    signature, compress_type, compressed_size, name_length, extra_length = (
+        header[0], header[4], header[8], header[10], header[11])
+    name = head[_LOCAL_HEADER.size:_LOCAL_HEADER.size + name_length]
+    if signature != b'PK\x03\x04' or compress_type != ZIP_STORED or name != INDEX_NAME.encode('utf-8'):
+        return None
+
+    start = _LOCAL_HEADER.size + name_length + extra_length
+    data = head[start:start + compressed_size]
+    while len(data) < compressed_size and (files or b'\n' not in data):
+        block = archive.read(min(compressed_size - len(data), 1 << 20))
+        if not block:
+            break
+        data += block
+
+    if not files:
+        return json.loads(data.split(b'\n', 1)[0])
+    lines = data.splitlines()
+    index = json.loads(lines[0])
+    index['files'] = [json.loads(line) for line in lines[1:]]
+    return index
+
+
+def read_indexed_file(archive, entry, verify=True):
+    """
+    Read one file of an archive using its skill-index.jsonl entry.
+
+    Args:
+        archive: Binary file object opened on the .skill file
+        entry: One item of index['files']
+        verify: Check the file's SHA-256 against the index
+
+    Returns:
+        The file's uncompressed contents
+
+    Raises:
+        ValueError: If verify is set and the contents do not match the index
+    """
+    archive.seek(entry['data_offset'])
+    data = archive.read(entry['compressed_size'])
+    method = entry['method']
+    if method == 'deflate':
+        data = zlib.decompress(data, -15)
+    elif method == 'lzma':
+        props_size = struct.unpack('<H', data[2:4])[0]
+        decompressor = lzma.LZMADecompressor(lzma.FORMAT_RAW, filters=[
+            lzma._decode_filter_properties(lzma.FILTER_LZMA1, data[4:4 + props_size]),
+        ])
+        data = decompressor.decompress(data[4 + props_size:])
+    if verify and entry.get('sha256') and hashlib.sha256(data).hexdigest() != entry['sha256']:
+        raise ValueError(f"Content of {entry['path']} does not match the index")
+    return data
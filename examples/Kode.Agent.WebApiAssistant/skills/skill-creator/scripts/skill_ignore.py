@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Skill Ignore - .skillignore rules and skill discovery used by package_skill.py and quick_validate.py
+
+A .skillignore file in the skill folder uses gitignore syntax:
+
+    # comment
+    *.log               any file or directory named *.log, at any depth
+    build/              directories only
+    /notes.md           anchored to the skill folder
+    docs/**/draft-*     ** matches any number of directories
+    !keep.log           re-include something excluded by an earlier rule
+
+The last matching rule wins. Built-in defaults (version control, caches,
+virtual environments, editor files, previous builds) are applied before the
+file's own rules, so they can be overridden with "!". Ignored directories are
+pruned during the walk and never descended into, so a file inside one cannot
+be re-included.
+"""
+
+import os
+import re
+from pathlib import Path
+
+IGNORE_FILENAME = '.skillignore'
+
+DEFAULT_PATTERNS = [
+    '.git/', '.hg/', '.svn/',
+    '__pycache__/', '*.py[cod]', '.mypy_cache/', '.pytest_cache/', '.ruff_cache/', '.tox/', '.ipynb_checkpoints/',
+    '.venv/', 'venv/', 'node_modules/',
+    '.idea/', '.vscode/', '*.swp', '*.swo', '*~', '.#*',
+    '.DS_Store', 'Thumbs.db', 'desktop.ini',
+    '*.skill', '*.skill.tmp', '*.skill.manifest.json', '*.skill.manifest.json.tmp',
+    IGNORE_FILENAME,
+]
+
+
+_UNANCHORED = '(?:.*/)?'
+
+
+def _translate(pattern):
+    """Translate one gitignore glob (without !, leading or trailing /) to a regex"""
+    i, n = 0, len(pattern)
+    out = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i) and (i == 0 or pattern[i - 1] == '/'):
+                if pattern.startswith('**/', i):
+                    out.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if i + 2 == n:
+                    out.append('.*')
+                    i += 2
+                    continue
+            while i + 1 < n and pattern[i + 1] == '*':
+                i += 1
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            j = pattern.find(']', j)
+            if j == -1:
+                out.append('\\[')
+            else:
+                stuff = pattern[i + 1:j].replace('\\', '\\\\')
+                if stuff[0] in '!^':
+                    stuff = '^' + stuff[1:]
+                out.append(f'[{stuff}]')
+                i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return ''.join(out)
+
+
+def parse_rule(line):
+    """
+    Parse one .skillignore line.
+
+    Returns:
+        (compiled regex, negate, directory_only, anchored), or None for blank lines and comments
+    """
+    line = line.rstrip('\r\n')
+    while line.endswith(' ') and not line.endswith('\\ '):
+        line = line[:-1]
+    if not line or line.startswith('#'):
+        return None
+
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    directory_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the skill folder
+    anchored = '/' in line
+    regex = _translate(line.lstrip('/'))
+    if not anchored:
+        regex = _UNANCHORED + regex
+    return re.compile(f'^{regex}$', re.DOTALL), negate, directory_only, anchored
+
+
+class IgnoreRules:
+    """An ordered list of gitignore-style rules matched against skill-relative paths"""
+
+    def __init__(self, patterns=()):
+        self.rules = [rule for rule in map(parse_rule, patterns) if rule is not None]
+        # Combined regexes reject the common case, a path no rule matches, with two matches:
+        # unanchored rules against the last path component, anchored ones against the whole path
+        self._any_file = self._combine(rule for rule in self.rules if not rule[2])
+        self._any_dir = self._combine(self.rules)
+
+    @staticmethod
+    def _combine(rules):
+        names, paths = [], []
+        for regex, _, _, anchored in rules:
+            pattern = regex.pattern[1:-1]
+            if anchored:
+                # May itself start with _UNANCHORED ("**/docs/draft.md") but still spans directories
+                paths.append(pattern)
+            else:
+                names.append(pattern[len(_UNANCHORED):])
+        return tuple(re.compile('^(?:' + '|'.join(patterns) + ')$', re.DOTALL) if patterns else None
+                     for patterns in (names, paths))
+
+    @classmethod
+    def for_skill(cls, skill_path, defaults=True):
+        """
+        Rules for a skill folder: the built-in defaults followed by its .skillignore, if any.
+        """
+        patterns = list(DEFAULT_PATTERNS) if defaults else []
+        ignore_file = Path(skill_path) / IGNORE_FILENAME
+        if ignore_file.is_file():
+            patterns.extend(ignore_file.read_text(encoding='utf-8').splitlines())
+        return cls(patterns)
+
+    def ignored(self, path, is_dir=False):
+        """
+        Check a path relative to the skill folder (forward slashes).
+
+        Returns:
+            True if the last rule matching path excludes it
+        """
+        names, paths = self._any_dir if is_dir else self._any_file
+        if not ((names and names.match(path.rpartition('/')[2])) or (paths and paths.match(path))):
+            return False
+        for regex, negate, directory_only, _ in reversed(self.rules):
+            if directory_only and not is_dir:
+                continue
+            if regex.match(path):
+                return not negate
+        return False
+
+
+def walk_skill(skill_path, rules=None, excluded=None):
+    """
+    Walk a skill folder, pruning ignored directories before descending into them.
+
+    Args:
+        skill_path: Path to the skill folder
+        rules: IgnoreRules to apply (defaults to IgnoreRules.for_skill(skill_path))
+        excluded: Optional list that receives each ignored path; directories end with "/"
+
+    Yields:
+        (file_path, relpath) for every file kept, relpath using forward slashes
+    """
+    skill_path = Path(skill_path)
+    if rules is None:
+        rules = IgnoreRules.for_skill(skill_path)
+
+    for dirpath, dirnames, filenames in os.walk(skill_path):
+        rel_dir = os.path.relpath(dirpath, skill_path)
+        prefix = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/') + '/'
+
+        kept = []
+        for name in dirnames:
+            if rules.ignored(prefix + name, is_dir=True):
+                if excluded is not None:
+                    excluded.append(prefix + name + '/')
+            else:
+                kept.append(name)
+        dirnames[:] = kept  # os.walk only descends into what is left here
+
+        for name in filenames:
+            relpath = prefix + name
+            if rules.ignored(relpath):
+                if excluded is not None:
+                    excluded.append(relpath)
+                continue
+            file_path = os.path.join(dirpath, name)
+            if os.path.isfile(file_path):
+                yield Path(file_path), relpath
+
+
+def discover_skills(skills_root):
+    """
+    Find every skill folder (a folder containing SKILL.md) under skills_root.
+
+    Ignored directories (see DEFAULT_PATTERNS) are not searched,
+    nor are the contents of a skill folder once found.
+
+    Returns:
+        Sorted list of skill folder Paths
+    """
+    rules = IgnoreRules(DEFAULT_PATTERNS)
+    skills = []
+    for dirpath, dirnames, filenames in os.walk(skills_root):
+        if 'SKILL.md' in filenames:
+            skills.append(Path(dirpath))
+            dirnames[:] = []
+        else:
+            dirnames[:] = [name for name in dirnames if not rules.ignored(name, is_dir=True)]
+    return sorted(skills)
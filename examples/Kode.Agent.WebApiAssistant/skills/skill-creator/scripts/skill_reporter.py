@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Skill Reporter - Output modes for package_skill.py
+
+package_skill.py reports through one of these instead of printing directly:
+
+    Reporter          base class; records errors and prints nothing
+    ConsoleReporter   status messages and a one-line summary (default);
+                      verbose=True also lists every file, printed after packaging
+    QuietReporter     errors only
+    ProgressReporter  console output plus a rate-limited progress line on stderr
+    JsonReporter      one JSON document with the result, messages and errors
+
+file_done() is called once per file from the packaging loop, so it must stay
+cheap: no reporter writes to the terminal there except ProgressReporter, at
+most once per interval.
+"""
+
+import json
+import os
+import sys
+import time
+
+
+class Reporter:
+    """Base reporter: collects errors, prints nothing"""
+
+    def __init__(self):
+        self.errors = []
+        self.result = None
+
+    def info(self, message):
+        """A status message"""
+
+    def error(self, message):
+        """An error message"""
+        self.errors.append(message)
+
+    def start(self, files):
+        """Packaging of files, a list of (file_path, arcname), is about to begin"""
+
+    def file_done(self, member):
+        """One member was written to the archive"""
+
+    def end(self, members):
+        """All members were written"""
+
+    def finish(self, result):
+        """Packaging is over; result is a dict describing the outcome"""
+        self.result = result
+
+
+class ConsoleReporter(Reporter):
+    """Prints status messages to stdout; verbose lists every file once packaging is done"""
+
+    def __init__(self, verbose=False):
+        super().__init__()
+        self.verbose = verbose
+
+    def info(self, message):
+        print(message)
+
+    def error(self, message):
+        super().error(message)
+        print(message)
+
+    def end(self, members):
+        if self.verbose:
+            print("\n".join(f"  {'Reused' if member.reused else 'Added'}: {member.arcname}" for member in members))
+        size = sum(member.size for member in members)
+        compressed = sum(member.compressed_size for member in members)
+        reused = sum(1 for member in members if member.reused)
+        summary = f"  Packed {len(members):,} files, {size:,} bytes -> {compressed:,} bytes"
+        print(summary + (f" ({reused:,} reused from the previous build)" if reused else ""))
+
+    def finish(self, result):
+        super().finish(result)
+        if result.get("peak_rss"):
+            print(f"   Peak RSS: {result['peak_rss'] / 2 ** 20:,.1f} MB")
+
+
+class QuietReporter(Reporter):
+    """Prints errors only"""
+
+    def error(self, message):
+        super().error(message)
+        print(message)
+
+
+class ProgressReporter(ConsoleReporter):
+    """
+    Console output plus a single progress line on stderr, redrawn at most every
+    interval seconds, showing files and bytes done and throughput.
+    """
+
+    def __init__(self, interval=0.2, stream=None):
+        super().__init__()
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.total_files = 0
+        self.total_bytes = 0
+        self.done_files = 0
+        self.done_bytes = 0
+        self._start = 0.0
+        self._next_draw = 0.0
+
+    def start(self, files):
+        self.total_files = len(files)
+        self.total_bytes = sum(os.stat(file_path).st_size for file_path, _ in files)
+        self._start = time.monotonic()
+        self._next_draw = self._start
+
+    def file_done(self, member):
+        self.done_files += 1
+        self.done_bytes += member.size
+        now = time.monotonic()
+        if now >= self._next_draw:
+            self._next_draw = now + self.interval
+            self._draw(now)
+
+    def _draw(self, now):
+        elapsed = max(now - self._start, 1e-9)
+        self.stream.write(
+            f"\r  {self.done_files:,}/{self.total_files:,} files  "
+            f"{self.done_bytes / 2 ** 20:,.1f}/{self.total_bytes / 2 ** 20:,.1f} MB  "
+            f"{self.done_bytes / elapsed / 2 ** 20:,.1f} MB/s "
+        )
+        self.stream.flush()
+
+    def end(self, members):
+        self._draw(time.monotonic())
+        self.stream.write("\n")
+        self.stream.flush()
+        super().end(members)
+
+
+class JsonReporter(Reporter):
+    """Collects messages and prints the result as one JSON document (if emit)"""
+
+    def __init__(self, emit=True):
+        super().__init__()
+        self.emit = emit
+        self.messages = []
+
+    def info(self, message):
+        self.messages.append(message)
+
+    def finish(self, result):
+        result = dict(result, messages=self.messages, errors=self.errors)
+        super().finish(result)
+        if self.emit:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Skill Resources - Deep checks of a skill's files, used by quick_validate.py --deep
+
+One os.scandir walk indexes every file the skill would ship (.skillignore
+applies) with its size and mode. SKILL.md is then checked against that index:
+
+    - every relative markdown link outside fenced code points at a file or folder
+    - every scripts/... path inside fenced code blocks (the commands an agent
+      runs) exists, and scripts run directly (first word of a command) are
+      executable and start with "#!"
+    - no file exceeds max_file_size, the files add up to at most max_total_size
+      and SKILL.md has at most max_skill_md_lines lines
+
+Every check is a dictionary lookup, so the cost is linear in the number of
+files plus the size of SKILL.md.
+"""
+
+import os
+import re
+from pathlib import PurePosixPath
+
+from skill_ignore import IgnoreRules
+
+DEFAULT_MAX_FILE_SIZE = 10 << 20
+DEFAULT_MAX_TOTAL_SIZE = 50 << 20
+DEFAULT_MAX_SKILL_MD_LINES = 500
+
+_FENCE = re.compile(r' {0,3}(`{3,}|~{3,})')
+_INLINE_LINK = re.compile(r'!?\[[^\]]*\]\(\s*(<[^>]*>|[^)\s]+)(?:\s+(?:"[^"]*"|\'[^\']*\'))?\s*\)')
+_REFERENCE_LINK = re.compile(r' {0,3}\[[^\]]+\]:\s*(<[^>]*>|\S+)')
+_SCRIPT_PATH = re.compile(r'(?<![\w./-])(?:\./)?(scripts/[\w./-]*\w)')
+_SCHEME = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:')
+
+
+def parse_size(value):
+    """Parse a size such as 500000, 64K, 100M or 2G into bytes"""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    value = value.strip().upper().removesuffix("B")
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+def index_skill(skill_path, rules=None):
+    """
+    Index a skill folder in a single os.scandir walk, pruning ignored directories.
+
+    Args:
+        skill_path: Path to the skill folder
+        rules: IgnoreRules to apply (defaults to IgnoreRules.for_skill(skill_path))
+
+    Returns:
+        (files, directories, ignored): files maps each relpath (forward slashes)
+        to its os.stat_result; directories and ignored are sets of relpaths
+    """
+    if rules is None:
+        rules = IgnoreRules.for_skill(skill_path)
+    files, directories, ignored = {}, set(), set()
+    pending = [(os.fspath(skill_path), '')]
+    while pending:
+        dirpath, prefix = pending.pop()
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                relpath = prefix + entry.name
+                is_dir = entry.is_dir()
+                if rules.ignored(relpath, is_dir=is_dir):
+                    ignored.add(relpath)
+                elif is_dir:
+                    directories.add(relpath)
+                    if not entry.is_symlink():
+                        pending.append((entry.path, relpath + '/'))
+                elif entry.is_file():
+                    files[relpath] = entry.stat()
+    return files, directories, ignored
+
+
+def skill_md_references(text):
+    """
+    Find the local paths SKILL.md refers to.
+
+    Returns:
+        List of (line number, kind, target): kind is "link" for relative markdown
+        links outside fenced code, "script" for scripts/... paths inside it, or
+        "command" for such a path that starts a command line
+    """
+    references = []
+    fence = None
+    for number, line in enumerate(text.splitlines(), 1):
+        match = _FENCE.match(line)
+        if match:
+            marker = match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence) and not line.strip(' `~'):
+                fence = None
+            continue
+        if fence is not None:
+            for match in _SCRIPT_PATH.finditer(line):
+                command = line[:match.start()].strip() in ('', '$')
+                references.append((number, 'command' if command else 'script', match.group(1)))
+            continue
+        targets = _INLINE_LINK.findall(line)
+        match = _REFERENCE_LINK.match(line)
+        if match:
+            targets.append(match.group(1))
+        for target in targets:
+            target = target.strip('<>').split('#', 1)[0].split('?', 1)[0]
+            if target and not _SCHEME.match(target):
+                references.append((number, 'link', _unquote(target)))
+    return references
+
+
+def _unquote(target):
+    """Decode %-escapes in a link target"""
+    if '%' not in target:
+        return target
+    from urllib.parse import unquote  # rarely needed, and slow to import
+
+    return unquote(target)
+
+
+def _resolve(target):
+    """Normalise a skill-relative path, or return None if it leaves the skill folder"""
+    parts = []
+    for part in PurePosixPath(target).parts:
+        if part in ('.', '/'):
+            continue
+        if part == '..':
+            if not parts:
+                return None
+            parts.pop()
+        else:
+            parts.append(part)
+    return '/'.join(parts)
+
+
+def _is_ignored(relpath, ignored):
+    """True if relpath or one of its parent folders was excluded from the index"""
+    path = PurePosixPath(relpath)
+    return any(str(candidate) in ignored for candidate in (path, *path.parents))
+
+
+def _check_command(skill_path, relpath, st):
+    """Problems with a script that SKILL.md runs directly"""
+    with open(os.path.join(skill_path, relpath), 'rb') as f:
+        if f.read(2) != b'#!':
+            return [f"{relpath} is run directly but has no #! line"]
+    if os.name != 'nt' and not st.st_mode & 0o111:
+        return [f"{relpath} is run directly but is not executable"]
+    return []
+
+
+def check_resources(skill_path, max_file_size=DEFAULT_MAX_FILE_SIZE, max_total_size=DEFAULT_MAX_TOTAL_SIZE,
+                    max_skill_md_lines=DEFAULT_MAX_SKILL_MD_LINES):
+    """
+    Check a skill's links, script references, script permissions and size budgets.
+
+    Args:
+        skill_path: Path to the skill folder (SKILL.md must exist)
+        max_file_size: Largest allowed file in bytes (None for no limit)
+        max_total_size: Largest allowed total of all files in bytes (None for no limit)
+        max_skill_md_lines: Most lines allowed in SKILL.md (None for no limit)
+
+    Returns:
+        List of problems, each a human-readable string (empty if none)
+    """
+    files, directories, ignored = index_skill(skill_path)
+    problems = []
+
+    with open(os.path.join(skill_path, 'SKILL.md'), encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    lines = len(text.splitlines())
+    if max_skill_md_lines is not None and lines > max_skill_md_lines:
+        problems.append(f"SKILL.md has {lines:,} lines (budget {max_skill_md_lines:,})")
+
+    commands = set()
+    for number, kind, target in skill_md_references(text):
+        relpath = _resolve(target)
+        what = "link" if kind == 'link' else "script reference"
+        if relpath is None:
+            problems.append(f"SKILL.md:{number}: {what} {target} points outside the skill folder")
+        elif relpath in files:
+            if kind == 'command' and relpath not in commands:
+                commands.add(relpath)
+                problems.extend(f"SKILL.md:{number}: {problem}" for problem in
+                                _check_command(skill_path, relpath, files[relpath]))
+        elif relpath and relpath not in directories:
+            if _is_ignored(relpath, ignored):
+                problems.append(f"SKILL.md:{number}: {what} {target} is excluded by .skillignore")
+            else:
+                problems.append(f"SKILL.md:{number}: broken {what} {target}")
+
+    total = 0
+    for relpath, st in sorted(files.items()):
+        total += st.st_size
+        if max_file_size is not None and st.st_size > max_file_size:
+            problems.append(f"{relpath} is {st.st_size:,} bytes (budget {max_file_size:,})")
+    if max_total_size is not None and total > max_total_size:
+        problems.append(f"Files add up to {total:,} bytes (budget {max_total_size:,})")
+    return problems
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for install_skill.py rejecting malformed archives, indexes and manifests
+
+Usage:
+    python -m unittest discover -s scripts
+"""
+
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from install_skill import install_skill
+from package_skill import package_skill
+from skill_archive import INDEX_NAME, manifest_path_for
+from skill_reporter import JsonReporter, QuietReporter
+
+
+class InstallSkillTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        skill = self.tmp / "src" / "demo-skill"
+        (skill / "references").mkdir(parents=True)
+        (skill / "SKILL.md").write_text("---\nname: demo-skill\ndescription: Skill used by the installer tests\n"
+                                        "---\n\n# Demo\n")
+        (skill / "references" / "guide.md").write_text("# Guide\n" * 100)
+        self.archive = package_skill(skill, self.tmp / "dist", reporter=QuietReporter())
+        self.dest = self.tmp / "installed"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def install(self):
+        reporter = JsonReporter(emit=False)
+        installed = install_skill(self.archive, self.dest, reporter=reporter)
+        return installed, reporter.result
+
+    def assertRejected(self, message):
+        installed, result = self.install()
+        self.assertIsNone(installed)
+        self.assertEqual(result["status"], "failed")
+        self.assertIn(message, result["error"])
+        self.assertEqual(list(self.dest.iterdir()) if self.dest.exists() else [], [])
+
+    def test_installs_a_packaged_skill(self):
+        installed, result = self.install()
+        self.assertEqual(result["status"], "ok")
+        self.assertEqual(installed, (self.dest / "demo-skill").resolve())
+        self.assertEqual((installed / "references" / "guide.md").read_text(), "# Guide\n" * 100)
+
+    def test_empty_manifest_is_rejected(self):
+        manifest_path_for(self.archive).write_text("{}")
+        self.assertRejected("Unreadable manifest")
+
+    def test_manifest_with_wrong_types_is_rejected(self):
+        manifest_path_for(self.archive).write_text(json.dumps({"files": ["demo-skill/SKILL.md"]}))
+        self.assertRejected("Unreadable manifest")
+
+    def test_corrupt_index_is_rejected(self):
+        data = bytearray(self.archive.read_bytes())
+        start = data.index(INDEX_NAME.encode()) + len(INDEX_NAME)
+        data[data.index(b"{", start)] = ord("X")
+        self.archive.write_bytes(bytes(data))
+        self.assertRejected(f"Corrupt {INDEX_NAME}")
+
+    def test_index_without_file_list_is_rejected(self):
+        data = bytearray(self.archive.read_bytes())
+        start = data.index(INDEX_NAME.encode()) + len(INDEX_NAME)
+        # Keep the length: turn the first file entry's "path" key into another key
+        at = data.index(b'"path"', start)
+        data[at:at + 6] = b'"pxth"'
+        self.archive.write_bytes(bytes(data))
+        self.assertRejected(f"Corrupt {INDEX_NAME}")
+
+    def test_unsafe_member_is_rejected(self):
+        with zipfile.ZipFile(self.archive, "a") as zipf:
+            zipf.writestr("demo-skill/../escape.txt", "outside")
+        self.assertRejected("Unsafe path")
+
+    def test_empty_member_names_are_rejected(self):
+        for name in ("", ".", "./", "/"):
+            with self.subTest(name=name):
+                with zipfile.ZipFile(self.archive, "a") as zipf:
+                    zipf.writestr(zipfile.ZipInfo(name), "")
+                self.assertRejected("Unsafe path")
+                self.archive = package_skill(self.tmp / "src" / "demo-skill", self.tmp / "dist",
+                                             reporter=QuietReporter())
+
+
+if __name__ == "__main__":
+    unittest.main()
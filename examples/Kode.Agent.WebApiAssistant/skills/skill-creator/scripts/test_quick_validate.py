@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for quick_validate.py's ValidationCache
+
+Usage:
+    python -m unittest discover -s scripts
+"""
+
+import json
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from quick_validate import ValidationCache
+
+
+def _make_skill(root, name):
+    skill = Path(root) / name
+    skill.mkdir(parents=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: Skill {name} for the cache tests\n---\n")
+    return skill
+
+
+def _validate_and_save(cache_path, skill):
+    cache = ValidationCache(cache_path)
+    cache.validate(skill)
+    cache.save()
+
+
+class ValidationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.cache_path = self.tmp / "cache" / "validate-cache.json"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def cached_paths(self):
+        return set(json.loads(self.cache_path.read_text())["files"])
+
+    def test_hit_after_save(self):
+        skill = _make_skill(self.tmp, "demo-skill")
+        _validate_and_save(self.cache_path, skill)
+        cache = ValidationCache(self.cache_path)
+        self.assertEqual(cache.validate(skill), (True, "Skill is valid!"))
+        self.assertEqual(cache.hits, 1)
+
+    def test_concurrent_saves_keep_every_entry(self):
+        skills = [_make_skill(self.tmp / "skills", f"skill-{i:02d}") for i in range(40)]
+        with ProcessPoolExecutor(max_workers=8) as executor:
+            list(executor.map(_validate_and_save, [self.cache_path] * len(skills), skills))
+        self.assertEqual(self.cached_paths(), {str(skill.resolve() / "SKILL.md") for skill in skills})
+
+    def test_save_does_not_revert_newer_entries(self):
+        skill_a = _make_skill(self.tmp, "skill-a")
+        skill_b = _make_skill(self.tmp, "skill-b")
+        _validate_and_save(self.cache_path, skill_a)
+        _validate_and_save(self.cache_path, skill_b)
+        # Loaded before skill-a changes and is re-validated elsewhere
+        stale = ValidationCache(self.cache_path)
+        (skill_a / "SKILL.md").write_text("---\nname: skill-a\ndescription: Changed\n---\n")
+        _validate_and_save(self.cache_path, skill_a)
+        stale.validate(skill_b)
+        stale.put(skill_b, True, "Skill is valid!")
+        stale.save()
+        entry = json.loads(self.cache_path.read_text())["files"][str(skill_a.resolve() / "SKILL.md")]
+        self.assertEqual(entry["size"], (skill_a / "SKILL.md").stat().st_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for .skillignore matching in skill_ignore.py
+
+Usage:
+    python -m unittest discover -s scripts
+"""
+
+import random
+import unittest
+
+from skill_ignore import IgnoreRules
+
+
+def ignored_by_loop(rules, path, is_dir=False):
+    """The plain last-match-wins loop, without the combined-regex prefilter"""
+    for regex, negate, directory_only, _ in reversed(rules.rules):
+        if directory_only and not is_dir:
+            continue
+        if regex.match(path):
+            return not negate
+    return False
+
+
+class IgnoreRulesTest(unittest.TestCase):
+
+    def test_leading_double_star_matches_at_any_depth(self):
+        rules = IgnoreRules(['**/docs/draft.md'])
+        self.assertTrue(rules.ignored('docs/draft.md'))
+        self.assertTrue(rules.ignored('a/docs/draft.md'))
+        self.assertTrue(rules.ignored('a/b/docs/draft.md'))
+        self.assertFalse(rules.ignored('a/docs/final.md'))
+        self.assertFalse(rules.ignored('draft.md'))
+
+    def test_leading_double_star_directory_rule(self):
+        rules = IgnoreRules(['**/build/cache/'])
+        self.assertTrue(rules.ignored('build/cache', True))
+        self.assertTrue(rules.ignored('x/build/cache', True))
+        self.assertFalse(rules.ignored('x/build/cache'))
+        self.assertFalse(rules.ignored('x/cache', True))
+
+    def test_unanchored_and_anchored_rules(self):
+        rules = IgnoreRules(['*.log', '/notes.md', 'docs/**/draft-*', '!keep.log'])
+        self.assertTrue(rules.ignored('a/b/run.log'))
+        self.assertFalse(rules.ignored('a/keep.log'))
+        self.assertTrue(rules.ignored('notes.md'))
+        self.assertFalse(rules.ignored('a/notes.md'))
+        self.assertTrue(rules.ignored('docs/x/y/draft-1.md'))
+        self.assertFalse(rules.ignored('a/docs/draft-1.md'))
+
+    def test_matches_rule_by_rule_loop(self):
+        rng = random.Random(25)
+        parts = ['a', 'b', 'docs', 'build', 'x.log', 'draft.md']
+        globs = ['a', 'b', 'docs', 'build', '*.log', 'draft.*', '*', '**']
+        for _ in range(2000):
+            patterns = []
+            for _ in range(rng.randint(1, 4)):
+                pattern = '/'.join(rng.choice(globs) for _ in range(rng.randint(1, 3)))
+                pattern = rng.choice(['', '/', '**/', '!', '!**/']) + pattern + rng.choice(['', '', '/'])
+                patterns.append(pattern)
+            rules = IgnoreRules(patterns)
+            for _ in range(10):
+                path = '/'.join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+                is_dir = rng.random() < 0.5
+                self.assertEqual(rules.ignored(path, is_dir), ignored_by_loop(rules, path, is_dir),
+                                 (patterns, path, is_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()